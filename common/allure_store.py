@@ -0,0 +1,185 @@
+"""
+按运行划分的Allure结果存储
+
+每次运行的结果写入独立的目录 reports/allure-runs/<运行ID>/，
+manifest.json记录每次运行的开始/结束时间、退出码、结果文件数和是否已生成报告。
+清理旧结果时按manifest整目录删除，不需要逐个stat结果文件；
+生成报告时只处理最新一次运行的结果，并把上一份报告的history复制过来延续趋势图。
+"""
+import json
+import os
+import shutil
+import subprocess
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+RUNS_DIR = Path('reports') / 'allure-runs'
+# 旧版本所有运行共用的结果目录
+LEGACY_RESULTS_DIR = Path('reports') / 'allure-results'
+REPORT_DIR = Path('reports') / 'allure-html'
+MANIFEST_NAME = 'manifest.json'
+
+
+class AllureStore:
+    """Allure结果目录和manifest的管理"""
+
+    def __init__(self, runs_dir: Path = RUNS_DIR):
+        self.runs_dir = Path(runs_dir)
+        self.manifest_path = self.runs_dir / MANIFEST_NAME
+
+    # ================== manifest ==================
+
+    def runs(self) -> List[Dict[str, Any]]:
+        """manifest中的所有运行，按开始时间排序"""
+        if not self.manifest_path.exists():
+            return []
+        return json.loads(self.manifest_path.read_text(encoding='utf-8'))['runs']
+
+    def _save(self, runs: List[Dict[str, Any]]) -> None:
+        self.runs_dir.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.manifest_path.with_suffix('.tmp')
+        tmp_path.write_text(json.dumps({'runs': runs}, ensure_ascii=False, indent=2), encoding='utf-8')
+        os.replace(tmp_path, self.manifest_path)
+
+    def _update(self, run_id: str, **fields) -> Dict[str, Any]:
+        runs = self.runs()
+        for run in runs:
+            if run['id'] == run_id:
+                run.update(fields)
+                self._save(runs)
+                return run
+        raise KeyError(f"manifest中没有运行: {run_id}")
+
+    def run_dir(self, run_id: str) -> Path:
+        return self.runs_dir / run_id
+
+    def latest(self) -> Optional[Dict[str, Any]]:
+        """最近一次运行"""
+        runs = self.runs()
+        return runs[-1] if runs else None
+
+    # ================== 运行 ==================
+
+    def new_run(self) -> str:
+        """创建新运行的结果目录并登记到manifest，返回运行ID"""
+        run_id = f"{datetime.now():%Y%m%d-%H%M%S}-{os.getpid()}"
+        self.run_dir(run_id).mkdir(parents=True, exist_ok=True)
+        runs = self.runs()
+        runs.append({
+            'id': run_id,
+            'started': time.time(),
+            'finished': None,
+            'exit_code': None,
+            'results': None,
+            'reported': False,
+        })
+        self._save(runs)
+        return run_id
+
+    def finish_run(self, run_id: str, exit_code: int) -> Dict[str, Any]:
+        """记录运行结束，只统计本次运行目录中的结果文件"""
+        results = sum(1 for name in os.listdir(self.run_dir(run_id)) if name.endswith('-result.json'))
+        return self._update(run_id, finished=time.time(), exit_code=int(exit_code), results=results)
+
+    def migrate_legacy(self, legacy_dir: Path = LEGACY_RESULTS_DIR) -> Optional[str]:
+        """
+        把旧版本的共用结果目录移动到运行目录中，登记为一次已生成报告的运行
+
+        开始时间取目录中最新文件的修改时间，之后与其他运行一起按时间清理。
+        旧目录只会被迁移一次（迁移后不再存在）。
+
+        Returns:
+            迁移后的运行ID，没有旧目录时返回None
+        """
+        legacy_dir = Path(legacy_dir)
+        if not legacy_dir.is_dir():
+            return None
+        files = [path for path in legacy_dir.iterdir() if path.is_file()]
+        if not files:
+            shutil.rmtree(legacy_dir, ignore_errors=True)
+            return None
+
+        started = max(path.stat().st_mtime for path in files)
+        run_id = f"legacy-{datetime.fromtimestamp(started):%Y%m%d-%H%M%S}"
+        self.runs_dir.mkdir(parents=True, exist_ok=True)
+        shutil.copytree(legacy_dir, self.run_dir(run_id), dirs_exist_ok=True)
+        shutil.rmtree(legacy_dir, ignore_errors=True)
+
+        runs = [run for run in self.runs() if run['id'] != run_id]
+        runs.append({
+            'id': run_id,
+            'started': started,
+            'finished': started,
+            'exit_code': None,
+            'results': sum(1 for path in files if path.name.endswith('-result.json')),
+            'reported': True,
+        })
+        runs.sort(key=lambda run: run['started'])
+        self._save(runs)
+        return run_id
+
+    def prune(self, days_to_keep: Optional[float] = None, keep_runs: Optional[int] = None) -> int:
+        """
+        删除旧运行的整个结果目录
+
+        Args:
+            days_to_keep: 保留最近几天内开始的运行
+            keep_runs: 最多保留的运行数
+
+        Returns:
+            删除的运行数
+        """
+        runs = self.runs()
+        keep = runs
+        if days_to_keep is not None:
+            cutoff = time.time() - days_to_keep * 86400
+            keep = [run for run in keep if run['started'] >= cutoff]
+        if keep_runs is not None:
+            keep = keep[-keep_runs:] if keep_runs > 0 else []
+        # 最新一次运行的结果始终保留，供生成报告使用
+        if runs and runs[-1] not in keep:
+            keep.append(runs[-1])
+
+        removed = [run for run in runs if run not in keep]
+        for run in removed:
+            shutil.rmtree(self.run_dir(run['id']), ignore_errors=True)
+        if removed:
+            self._save(keep)
+        return len(removed)
+
+    # ================== 报告 ==================
+
+    def generate_report(self, report_dir: Path = REPORT_DIR, force: bool = False) -> bool:
+        """
+        用Allure CLI为最新一次运行生成HTML报告
+
+        最新运行已生成过报告时跳过（force为True时除外）；
+        上一份报告的history复制到本次结果中，趋势图不需要重新处理历史结果。
+
+        Returns:
+            是否生成了报告
+        """
+        run = self.latest()
+        if run is None or (run['reported'] and not force):
+            return False
+
+        report_dir = Path(report_dir)
+        results_dir = self.run_dir(run['id'])
+        history_dir = report_dir / 'history'
+        if history_dir.is_dir():
+            shutil.copytree(history_dir, results_dir / 'history', dirs_exist_ok=True)
+
+        try:
+            completed = subprocess.run(
+                ['allure', 'generate', str(results_dir), '-o', str(report_dir), '--clean'],
+                shell=os.name == 'nt'
+            )
+        except FileNotFoundError:
+            # 未安装Allure CLI
+            return False
+        if completed.returncode != 0:
+            return False
+        self._update(run['id'], reported=True)
+        return True
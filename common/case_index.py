@@ -0,0 +1,201 @@
+"""
+用例文件索引
+
+只扫描行而不解析YAML，记录每个顶层键和其中每个用例（按id）在文件中的字节范围，
+之后按需只解析需要的片段。文件使用锚点/别名或不是“顶层键 -> 用例列表”的
+简单结构，或有用例没有可识别的id行（如流式映射 - {id: x}）时，索引不可用（is_supported为False），调用方应退回到解析整个文件。
+"""
+import re
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Mapping, NamedTuple, Optional, Tuple
+
+import yaml
+
+_TOP_LEVEL_KEY = re.compile(rb'^([A-Za-z_][\w-]*):\s*(#.*)?$')
+_LIST_ITEM = re.compile(rb'^(\s*)-(?:[ \t]+|(?=\r?\n)|$)')
+# 从用例内容的起始列开始匹配，值（包括引号和注释）由YAML解析
+_ID_LINE = re.compile(rb'^id:(?=\s|$)(.*)$', re.DOTALL)
+# 锚点、别名和合并键需要整个文件的上下文才能解析
+_ANCHOR_OR_ALIAS = re.compile(rb'(?:^|[\s\[,{])[&*][\w-]|<<:')
+
+
+class CaseSpan(NamedTuple):
+    case_id: Optional[str]
+    start: int
+    end: int
+
+
+class SectionSpan(NamedTuple):
+    start: int
+    end: int
+    cases: Tuple[CaseSpan, ...]
+
+
+class CaseIndex:
+    """用例文件的行偏移索引"""
+
+    def __init__(self, path: Path, sections: Optional[Dict[str, SectionSpan]]):
+        self.path = Path(path)
+        self._sections = sections
+
+    @property
+    def is_supported(self) -> bool:
+        return self._sections is not None
+
+    def keys(self) -> List[str]:
+        return list(self._sections or {})
+
+    def section(self, key: str) -> Optional[SectionSpan]:
+        return (self._sections or {}).get(key)
+
+    def find_case(self, case_id: str) -> Optional[Tuple[str, CaseSpan]]:
+        """按id查找用例所在的顶层键和范围"""
+        for key, section in (self._sections or {}).items():
+            for case in section.cases:
+                if case.case_id == case_id:
+                    return key, case
+        return None
+
+    def load_section(self, key: str):
+        """只解析一个顶层键下的内容，键不存在时返回None"""
+        section = self.section(key)
+        if section is None:
+            return None
+        return self._parse(section.start, section.end)
+
+    def load_case(self, case: CaseSpan):
+        """只解析一个用例"""
+        parsed = self._parse(case.start, case.end)
+        return parsed[0] if parsed else None
+
+    def iter_cases(self, key: str) -> Iterator:
+        """逐个解析顶层键下的用例，每次只读取一个用例的片段"""
+        section = self.section(key)
+        if section is None:
+            return
+        with open(self.path, 'rb') as file:
+            for case in section.cases:
+                file.seek(case.start)
+                parsed = _load_yaml(file.read(case.end - case.start))
+                if parsed:
+                    yield parsed[0]
+
+    def _parse(self, start: int, end: int):
+        with open(self.path, 'rb') as file:
+            file.seek(start)
+            return _load_yaml(file.read(end - start))
+
+    @classmethod
+    def build(cls, path: Path) -> 'CaseIndex':
+        """扫描文件建立索引"""
+        with open(path, 'rb') as file:
+            lines = file.readlines()
+        return cls(path, _scan(lines))
+
+
+def _load_yaml(content: bytes):
+    # 在此处导入以避免循环导入
+    from common.case_store import YamlLoader
+    return yaml.load(content, Loader=YamlLoader)
+
+
+def normalize_case_id(value: Any) -> Optional[str]:
+    """用例id统一按字符串比较（id: 3 与 --case-id 3 匹配），没有id或id不是标量时返回None"""
+    if value is None or isinstance(value, (Mapping, list, tuple)):
+        return None
+    return str(value)
+
+
+def _parse_id(raw: bytes) -> Optional[str]:
+    """解析id行的值，无法单独解析（如块标量）时返回None"""
+    if raw.strip().startswith((b'|', b'>')):
+        return None
+    try:
+        return normalize_case_id(_load_yaml(raw))
+    except yaml.YAMLError:
+        return None
+
+
+def _is_blank_or_comment(line: bytes) -> bool:
+    stripped = line.strip()
+    return not stripped or stripped.startswith(b'#')
+
+
+def _scan(lines: List[bytes]) -> Optional[Dict[str, SectionSpan]]:
+    """扫描所有行，结构不受支持时返回None"""
+    sections: Dict[str, SectionSpan] = {}
+    offset = 0
+    current_key: Optional[str] = None
+    section_start = 0
+    item_indent: Optional[bytes] = None
+    cases: List[CaseSpan] = []
+    case_start: Optional[int] = None
+    case_id: Optional[str] = None
+    # 用例内容（映射的键）的起始列，"-" 单独一行时由下一行决定
+    content_column: Optional[int] = None
+
+    def close_case(end: int) -> bool:
+        """结束当前用例，用例没有可识别的id行时返回False"""
+        if case_start is not None:
+            if case_id is None:
+                return False
+            cases.append(CaseSpan(case_id, case_start, end))
+        return True
+
+    def close_section(end: int) -> bool:
+        if not close_case(end):
+            return False
+        if current_key is not None:
+            sections[current_key] = SectionSpan(section_start, end, tuple(cases))
+        return True
+
+    for line in lines:
+        if line.startswith(b'---') or line.startswith(b'%') or _ANCHOR_OR_ALIAS.search(line):
+            return None
+        if _is_blank_or_comment(line):
+            offset += len(line)
+            continue
+
+        top_level = _TOP_LEVEL_KEY.match(line)
+        if top_level:
+            if not close_section(offset):
+                return None
+            current_key = top_level.group(1).decode('utf-8')
+            if current_key in sections:
+                return None
+            section_start = offset + len(line)
+            item_indent = None
+            cases = []
+            case_start = None
+            case_id = None
+        elif current_key is None or not line[:1].isspace() and not _LIST_ITEM.match(line):
+            # 顶层出现了键以外的内容（如内联值或多文档）
+            return None
+        else:
+            item = _LIST_ITEM.match(line)
+            indent = len(line) - len(line.lstrip())
+            if item_indent is None:
+                if not item:
+                    # 顶层键下不是用例列表
+                    return None
+                item_indent = item.group(1)
+            if item and item.group(1) == item_indent:
+                if not close_case(offset):
+                    return None
+                case_start = offset
+                case_id = None
+                content = item.end()
+                content_column = content if line[content:].strip() else None
+            elif indent <= len(item_indent):
+                return None
+            elif content_column is None:
+                content_column = indent
+            if case_id is None and content_column is not None:
+                match = _ID_LINE.match(line[content_column:])
+                if match and (item or indent == content_column):
+                    case_id = _parse_id(match.group(1))
+        offset += len(line)
+
+    if not close_section(offset):
+        return None
+    return sections
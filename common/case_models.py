@@ -0,0 +1,331 @@
+"""
+测试用例模型
+
+每个YAML用例段（如reserve_cases.yaml的reserve_success_cases）对应一个不可变的
+slots数据类。用例在加载时按字段类型校验一次：缺少字段、多余字段或类型错误
+都会抛出CaseSchemaError，在启动浏览器之前发现错误的测试数据。
+"""
+import os
+from collections import abc
+from dataclasses import MISSING, dataclass, fields, is_dataclass
+from datetime import date
+from types import MappingProxyType
+from typing import Any, Dict, Iterable, Mapping, Optional, Tuple, Type, Union, get_args, get_origin, get_type_hints
+
+_record = dataclass(frozen=True, slots=True)
+
+
+class CaseRecord:
+    """用例模型基类"""
+
+    __slots__ = ()
+
+    @classmethod
+    def from_mapping(cls, data: Any, where: str) -> 'CaseRecord':
+        """校验并转换一条YAML数据"""
+        if not isinstance(data, Mapping):
+            raise CaseSchemaError(f"{where}: 应为映射，实际为 {type(data).__name__}")
+        hints = get_type_hints(cls)
+        names = {field.name for field in fields(cls)}
+
+        unknown = set(data) - names
+        if unknown:
+            raise CaseSchemaError(f"{where}: 未知字段 {sorted(unknown)}")
+        missing = [field.name for field in fields(cls) if field.name not in data and _is_required(field)]
+        if missing:
+            raise CaseSchemaError(f"{where}: 缺少字段 {missing}")
+
+        values = {
+            name: _convert(value, hints[name], f"{where}.{name}")
+            for name, value in data.items()
+        }
+        return cls(**values)
+
+
+def _is_required(field) -> bool:
+    return field.default is MISSING and field.default_factory is MISSING
+
+
+def _convert(value: Any, hint: Any, where: str) -> Any:
+    """按类型注解校验值，映射转换为MappingProxyType，列表转换为tuple"""
+    if hint is Any:
+        return value
+
+    origin = get_origin(hint)
+    if origin is Union:
+        options = get_args(hint)
+        if value is None and type(None) in options:
+            return None
+        for option in options:
+            if option is type(None):
+                continue
+            try:
+                return _convert(value, option, where)
+            except CaseSchemaError:
+                continue
+        raise CaseSchemaError(f"{where}: 类型应为 {hint}，实际为 {value!r}")
+
+    if isinstance(hint, type) and is_dataclass(hint) and issubclass(hint, CaseRecord):
+        return hint.from_mapping(value, where)
+
+    if origin in (abc.Mapping, dict):
+        if not isinstance(value, Mapping):
+            raise CaseSchemaError(f"{where}: 应为映射，实际为 {value!r}")
+        key_hint, value_hint = get_args(hint) or (Any, Any)
+        return MappingProxyType({
+            _convert(key, key_hint, where): _convert(item, value_hint, f"{where}.{key}")
+            for key, item in value.items()
+        })
+
+    if origin is tuple:
+        if not isinstance(value, (list, tuple)):
+            raise CaseSchemaError(f"{where}: 应为列表，实际为 {value!r}")
+        item_hint = get_args(hint)[0]
+        return tuple(_convert(item, item_hint, f"{where}[{i}]") for i, item in enumerate(value))
+
+    # bool是int的子类，需要单独区分
+    if hint is int and isinstance(value, bool) or not isinstance(value, hint):
+        raise CaseSchemaError(f"{where}: 类型应为 {hint.__name__}，实际为 {value!r}")
+    return value
+
+
+# ================== 登录用例 ==================
+
+@_record
+class LoginSuccessCase(CaseRecord):
+    id: str
+    description: str
+    email: str
+    password: str
+    expected_header: str
+
+
+@_record
+class LoginFailureCase(CaseRecord):
+    id: str
+    description: str
+    email: str
+    password: str
+    expected_email_msg: str
+    expected_password_msg: str
+
+
+# ================== 注册用例 ==================
+
+@_record
+class SignupSuccessCase(CaseRecord):
+    id: str
+    description: str
+    email: str
+    password: str
+    password_confirmation: str
+    username: str
+    rank: str
+    address: str
+    tel: str
+    gender: str
+    birthday: Optional[Union[str, date]]
+    notification: bool
+    expected_header: str
+
+
+@_record
+class SignupFailureCase(CaseRecord):
+    id: str
+    description: str
+    email: str
+    password: str
+    password_confirmation: str
+    username: str
+    rank: str
+    address: str
+    tel: str
+    gender: str
+    birthday: Optional[Union[str, date]]
+    notification: bool
+    expected_messages: Mapping[str, str]
+
+
+# ================== 个人页面用例 ==================
+
+@_record
+class Credentials(CaseRecord):
+    email: str
+    password: str
+
+
+@_record
+class IconData(CaseRecord):
+    file_path: str
+    zoom: Optional[int]
+    color: Optional[str]
+
+
+@_record
+class IconResults(CaseRecord):
+    image_exists: bool
+    image_width: int
+    border_color: str
+
+
+@_record
+class ExistingUserCase(CaseRecord):
+    id: str
+    description: str
+    email: str
+    password: str
+    expected_data: Mapping[str, str]
+
+
+@_record
+class NewUserCase(CaseRecord):
+    id: str
+    description: str
+    signup_data: Mapping[str, Any]
+    expected_data: Mapping[str, str]
+
+
+@_record
+class IconCase(CaseRecord):
+    id: str
+    description: str
+    login_data: Credentials
+    icon_data: IconData
+    expected_success: bool
+    expected_message: Optional[str] = None
+    expected_results: Optional[IconResults] = None
+
+
+@_record
+class DeleteUserCase(CaseRecord):
+    id: str
+    description: str
+    login_data: Credentials
+    expected_confirm_message: str
+    expected_complete_message: str
+    expected_redirect_url: str
+
+
+# ================== 预订用例 ==================
+
+@_record
+class PageInitCase(CaseRecord):
+    id: str
+    description: str
+    is_logged_in: bool
+    login_email: str
+    login_password: str
+    plan_title: str
+    expected_plan_name: str
+    expected_reserve_term: str
+    expected_head_count: str
+    expected_username: str
+    expected_email: str
+    expected_tel: str
+    expected_room_header: str
+    has_login_data: bool
+
+
+@_record
+class InputValidationCase(CaseRecord):
+    id: str
+    description: str
+    plan_title: str
+    reserve_date: str
+    reserve_term: str
+    head_count: str
+    username: str
+    # 值为None表示不校验具体的错误消息
+    expected_messages: Mapping[str, Optional[str]]
+
+
+@_record
+class SubmitValidationCase(CaseRecord):
+    id: str
+    description: str
+    plan_title: str
+    username: str
+    contact_type: str
+    email: str
+    tel: str
+    expected_messages: Mapping[str, str]
+
+
+@_record
+class ReserveSuccessCase(CaseRecord):
+    id: str
+    description: str
+    is_logged_in: bool
+    login_email: str
+    login_password: str
+    plan_title: str
+    username: str
+    contact_type: str
+    email: str
+    tel: str
+    comment: str
+    reserve_date: str
+    reserve_term: str
+    head_count: str
+    breakfast_plan: bool
+    early_check_in_plan: bool
+    sightseeing_plan: bool
+    expected_plan_name: str
+    expected_head_count: str
+    expected_username: str
+    expected_contact: str
+    expected_comment: str
+    expected_modal_message: str
+    # expected_plans与expected_plans_contain/expected_plans_not_contain二选一
+    expected_plans: Optional[str] = None
+    expected_plans_contain: Optional[Tuple[str, ...]] = None
+    expected_plans_not_contain: Tuple[str, ...] = ()
+
+
+# 用例文件名 -> 用例段 -> 模型
+SECTION_MODELS: Dict[str, Dict[str, Type[CaseRecord]]] = {
+    'login_cases.yaml': {
+        'login_success_cases': LoginSuccessCase,
+        'login_failure_cases': LoginFailureCase,
+    },
+    'signup_cases.yaml': {
+        'signup_success_cases': SignupSuccessCase,
+        'signup_failure_cases': SignupFailureCase,
+    },
+    'mypage_cases.yaml': {
+        'existing_users_cases': ExistingUserCase,
+        'new_user_cases': NewUserCase,
+        'icon_test_cases': IconCase,
+        'delete_user_cases': DeleteUserCase,
+    },
+    'reserve_cases.yaml': {
+        'page_init_cases': PageInitCase,
+        'input_validation_cases': InputValidationCase,
+        'submit_validation_cases': SubmitValidationCase,
+        'reserve_success_cases': ReserveSuccessCase,
+    },
+}
+
+
+def model_for(path: str, case_key: str) -> Optional[Type[CaseRecord]]:
+    """获取用例段对应的模型，没有定义模型时返回None"""
+    return SECTION_MODELS.get(os.path.basename(path), {}).get(case_key)
+
+
+def build_case(model: Type[CaseRecord], data: Any, path: str, case_key: str, index: int) -> CaseRecord:
+    """校验并转换一条用例"""
+    case_id = data.get('id') if isinstance(data, Mapping) else None
+    where = f"{os.path.basename(path)}:{case_key}[{case_id or index}]"
+    return model.from_mapping(data, where)
+
+
+def build_cases(model: Type[CaseRecord], cases: Iterable[Any], path: str, case_key: str) -> Tuple[CaseRecord, ...]:
+    """校验并转换一个用例段的所有用例"""
+    return tuple(build_case(model, data, path, case_key, i) for i, data in enumerate(cases))
+
+
+# ================== 自定义异常 ==================
+
+class CaseSchemaError(ValueError):
+    """测试数据不符合用例模型"""
+    pass
@@ -0,0 +1,220 @@
+"""
+测试数据存储
+
+每个YAML用例文件在一次运行中只解析一次（可用时使用libyaml的C解析器），
+解析结果缓存在内存中，同时以pickle保存到磁盘，下次运行文件未变化时直接读取。
+返回的用例是不可修改的：定义了模型的用例段返回common.case_models中的模型对象，
+其他返回MappingProxyType和tuple，避免一个测试修改了共享的用例数据影响其他测试。
+
+按顶层键获取用例时通过行偏移索引（common.case_index）只解析该键下的内容；
+用select指定用例id后只解析这些用例，大文件的收集时间不随数据量增长。
+"""
+import hashlib
+import os
+import pickle
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from types import MappingProxyType
+from typing import Any, Callable, Dict, Iterable, Iterator, Mapping, Optional, Set, Tuple
+
+import yaml
+
+from common.case_index import CaseIndex, normalize_case_id
+from common.case_models import build_cases, model_for
+
+# 优先使用C实现的解析器，未安装libyaml时退回纯Python实现
+YamlLoader = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+
+DATA_DIR = Path(__file__).resolve().parent.parent / 'data'
+CACHE_DIR = Path(__file__).resolve().parent.parent / '.case_cache'
+
+# 缓存格式变化时递增，使旧的磁盘缓存失效
+_CACHE_VERSION = 2
+
+
+def freeze(value: Any) -> Any:
+    """把解析结果转换为不可修改的对象"""
+    if isinstance(value, dict):
+        return MappingProxyType({key: freeze(item) for key, item in value.items()})
+    if isinstance(value, list):
+        return tuple(freeze(item) for item in value)
+    return value
+
+
+class CaseStore:
+    """
+    YAML用例文件的缓存
+
+    内存缓存按 (文件路径, 顶层键) 保存；磁盘缓存先比较文件的修改时间和大小，
+    不一致时再比较内容哈希，只是被touch过的文件不需要重新解析。
+    """
+
+    def __init__(self, cache_dir: Optional[Path] = CACHE_DIR):
+        self.cache_dir = Path(cache_dir) if cache_dir else None
+        # 只加载这些id的用例，None表示不限制
+        self.case_ids: Optional[Set[str]] = None
+        self._data: Dict[Tuple[str, Optional[str]], Any] = {}
+        self._indexes: Dict[str, Tuple[Tuple[int, int], CaseIndex]] = {}
+        self._lock = threading.Lock()
+        # 每个文件一把锁，同一文件不会被多个线程同时解析
+        self._file_locks: Dict[str, threading.Lock] = {}
+
+    def select(self, case_ids: Optional[Iterable[str]]) -> None:
+        """只加载指定id的用例（如--case-id），传入None取消限制"""
+        self.case_ids = set(case_ids) if case_ids else None
+
+    def load(self, path: str) -> Mapping[str, Any]:
+        """获取整个用例文件的内容"""
+        key = os.path.realpath(path)
+        return self._cached(key, None, lambda content: yaml.load(content, Loader=YamlLoader) or {})
+
+    def index(self, path: str) -> CaseIndex:
+        """获取用例文件的索引，文件变化后重新建立"""
+        key = os.path.realpath(path)
+        stat = os.stat(key)
+        signature = (stat.st_mtime_ns, stat.st_size)
+        cached = self._indexes.get(key)
+        if cached is None or cached[0] != signature:
+            cached = self._indexes[key] = (signature, CaseIndex.build(Path(key)))
+        return cached[1]
+
+    def get_cases(self, path: str, case_key: str) -> Tuple[Any, ...]:
+        """
+        获取用例文件中指定键下的用例，设置了case_ids时只返回（和解析）这些用例
+
+        用例段在common.case_models中定义了模型时返回校验过的模型对象，否则返回不可修改的映射
+        """
+        index = self.index(path)
+        build = self._builder(path, case_key)
+        if self.case_ids is not None:
+            if index.is_supported:
+                section = index.section(case_key)
+                cases = [index.load_case(case) for case in section.cases
+                         if case.case_id in self.case_ids] if section else []
+            else:
+                cases = [case for case in self.load(path).get(case_key, ())
+                         if normalize_case_id(case.get('id')) in self.case_ids]
+            return build(cases)
+
+        if index.is_supported:
+            parse = lambda content: index.load_section(case_key) or []
+        else:
+            parse = lambda content: (yaml.load(content, Loader=YamlLoader) or {}).get(case_key) or []
+        return self._cached(os.path.realpath(path), case_key, parse, build)
+
+    def iter_cases(self, path: str, case_key: str) -> Iterator[Any]:
+        """
+        逐个返回指定键下的用例，每次只解析一个用例且不缓存，用于非常大的用例列表
+        """
+        index = self.index(path)
+        build = self._builder(path, case_key)
+        cases = index.iter_cases(case_key) if index.is_supported else iter(self.load(path).get(case_key, ()))
+        for case in cases:
+            if self.case_ids is None or normalize_case_id(case.get('id')) in self.case_ids:
+                yield build([case])[0]
+
+    def preload(self, paths: Iterable[str], max_workers: int = 4) -> None:
+        """在线程池中同时加载多个用例文件的所有顶层键；指定了case_ids时只建立索引"""
+        def load_all(path: str) -> None:
+            index = self.index(path)
+            if self.case_ids is not None:
+                return
+            case_keys = index.keys() if index.is_supported else list(self.load(path))
+            for case_key in case_keys:
+                self.get_cases(path, case_key)
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            list(executor.map(load_all, paths))
+
+    def clear(self) -> None:
+        """清空内存缓存"""
+        with self._lock:
+            self._data.clear()
+            self._indexes.clear()
+
+    @staticmethod
+    def _builder(path: str, case_key: str) -> Callable[[Any], Any]:
+        """把解析结果转换为用例模型或不可修改的对象"""
+        model = model_for(path, case_key)
+        if model is None:
+            return freeze
+        return lambda cases: build_cases(model, cases, path, case_key)
+
+    def _cached(self, path: str, section: Optional[str], parse: Callable[[bytes], Any],
+                build: Callable[[Any], Any] = freeze) -> Any:
+        """依次从内存缓存、磁盘缓存获取解析结果，都没有时调用parse解析，再用build转换"""
+        data = self._data.get((path, section))
+        if data is not None:
+            return data
+
+        with self._lock:
+            file_lock = self._file_locks.setdefault(path, threading.Lock())
+        with file_lock:
+            data = self._data.get((path, section))
+            if data is None:
+                data = self._data[(path, section)] = build(self._load_uncached(Path(path), section, parse))
+        return data
+
+    def _load_uncached(self, path: Path, section: Optional[str], parse: Callable[[bytes], Any]) -> Any:
+        """从磁盘缓存读取，缓存不存在或已过期时解析并写入缓存"""
+        stat = path.stat()
+        cache_file = self._cache_file(path, section)
+        cached = self._read_cache(cache_file)
+        if cached and (cached['mtime_ns'], cached['size']) == (stat.st_mtime_ns, stat.st_size):
+            return cached['data']
+
+        content = path.read_bytes()
+        digest = hashlib.sha256(content).hexdigest()
+        if cached and cached['sha256'] == digest:
+            data = cached['data']
+        else:
+            data = parse(content)
+        self._write_cache(cache_file, {
+            'version': _CACHE_VERSION,
+            'mtime_ns': stat.st_mtime_ns,
+            'size': stat.st_size,
+            'sha256': digest,
+            'data': data,
+        })
+        return data
+
+    def _cache_file(self, path: Path, section: Optional[str]) -> Optional[Path]:
+        if self.cache_dir is None:
+            return None
+        name = hashlib.sha1(str(path).encode('utf-8')).hexdigest()[:16]
+        suffix = f".{section}" if section else ""
+        return self.cache_dir / f"{path.stem}-{name}{suffix}.pickle"
+
+    @staticmethod
+    def _read_cache(cache_file: Optional[Path]) -> Optional[Dict[str, Any]]:
+        if cache_file is None or not cache_file.exists():
+            return None
+        try:
+            with open(cache_file, 'rb') as file:
+                cached = pickle.load(file)
+        except Exception:
+            # 缓存损坏时重新解析
+            return None
+        if not isinstance(cached, dict) or cached.get('version') != _CACHE_VERSION:
+            return None
+        return cached
+
+    @staticmethod
+    def _write_cache(cache_file: Optional[Path], cached: Dict[str, Any]) -> None:
+        if cache_file is None:
+            return
+        try:
+            cache_file.parent.mkdir(parents=True, exist_ok=True)
+            # 先写临时文件再替换，并行的工作进程不会读到写了一半的缓存
+            tmp_file = cache_file.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+            with open(tmp_file, 'wb') as file:
+                pickle.dump(cached, file, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_file, cache_file)
+        except OSError:
+            # 缓存目录不可写时只使用内存缓存
+            pass
+
+
+# 整个进程共享的用例存储
+case_store = CaseStore()
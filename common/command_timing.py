@@ -0,0 +1,197 @@
+import json
+import os
+import sys
+import threading
+import time
+from collections import defaultdict
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from selenium import webdriver
+from selenium.webdriver.support.ui import WebDriverWait
+
+PAGES_DIR = str(Path(__file__).resolve().parent.parent / 'pages')
+_BASE_PAGE_FILE = os.path.join(PAGES_DIR, 'base_page.py')
+
+# 命令分类，用于单个测试的耗时分解
+_NAVIGATION_COMMANDS = {'get', 'goBack', 'goForward', 'refresh'}
+_FIND_COMMANDS = {'findElement', 'findElements', 'findChildElement', 'findChildElements'}
+_SCRIPT_COMMANDS = {'w3cExecuteScript', 'w3cExecuteScriptAsync', 'executeCdpCommand'}
+
+
+class CommandTimer:
+    """
+    WebDriver命令耗时统计
+
+    包装driver.command_executor.execute记录每个命令的名称、定位符和耗时，
+    并包装WebDriverWait.until/until_not记录等待（含轮询间隔的休眠）的总耗时。
+    每条记录归属到当前测试和调用它的页面对象方法（如 ReservePage.set_reserve_term）。
+    """
+
+    def __init__(self):
+        self.records: List[Dict[str, Any]] = []
+        self.current_test: Optional[str] = None
+        self._lock = threading.Lock()
+        self._wait_patched = False
+
+    def install(self, driver: webdriver.Chrome) -> None:
+        """开始记录driver的命令"""
+        executor = driver.command_executor
+        original_execute = executor.execute
+        if getattr(original_execute, '_command_timer', None) is self:
+            return
+
+        def timed_execute(command, params):
+            start = time.perf_counter()
+            try:
+                return original_execute(command, params)
+            finally:
+                self.record(command, params, time.perf_counter() - start)
+
+        timed_execute._command_timer = self
+        executor.execute = timed_execute
+        self._patch_waits()
+
+    def record_startup(self, seconds: float) -> None:
+        """记录浏览器启动耗时"""
+        self._append('startup', None, seconds, '(browser startup)', False)
+
+    def record(self, command: str, params: Optional[Dict[str, Any]], seconds: float) -> None:
+        """记录一个命令"""
+        locator = None
+        if params and command in _FIND_COMMANDS:
+            locator = f"{params.get('using')}={params.get('value')}"
+        caller, in_wait = self._caller()
+        self._append(command, locator, seconds, caller, in_wait)
+
+    def test_breakdown(self, nodeid: str) -> Dict[str, Any]:
+        """单个测试的耗时分解：按类别和页面对象方法汇总"""
+        records = [r for r in self.records if r['test'] == nodeid]
+        by_category: Dict[str, float] = defaultdict(float)
+        by_caller: Dict[str, float] = defaultdict(float)
+        for r in records:
+            by_category[self._category(r)] += r['seconds']
+            if r['command'] != 'wait':
+                by_caller[r['caller']] += r['seconds']
+        return {
+            'commands': sum(1 for r in records if r['command'] not in ('wait', 'startup')),
+            'by_category': dict(sorted(by_category.items(), key=lambda x: -x[1])),
+            'by_caller': dict(sorted(by_caller.items(), key=lambda x: -x[1])),
+        }
+
+    def format_breakdown(self, nodeid: str) -> str:
+        """单个测试耗时分解的文本形式"""
+        breakdown = self.test_breakdown(nodeid)
+        lines = [f"WebDriver命令数: {breakdown['commands']}", "", "按类别:"]
+        lines += [f"  {name:<12} {seconds:8.3f}s" for name, seconds in breakdown['by_category'].items()]
+        lines += ["", "按页面对象方法:"]
+        lines += [f"  {name:<50} {seconds:8.3f}s" for name, seconds in breakdown['by_caller'].items()]
+        return "\n".join(lines)
+
+    def hotspots(self, limit: int = 20) -> List[Dict[str, Any]]:
+        """全部测试中按 调用方法 + 命令 汇总的耗时热点"""
+        totals: Dict[tuple, List[float]] = defaultdict(list)
+        for r in self.records:
+            totals[(r['caller'], r['command'], r['locator'])].append(r['seconds'])
+        rows = [
+            {'caller': caller, 'command': command, 'locator': locator,
+             'count': len(durations), 'total': sum(durations), 'avg': sum(durations) / len(durations)}
+            for (caller, command, locator), durations in totals.items()
+        ]
+        rows.sort(key=lambda row: -row['total'])
+        return rows[:limit]
+
+    def format_hotspots(self, limit: int = 20) -> str:
+        """耗时热点表格"""
+        lines = [f"{'总耗时':>9} {'次数':>6} {'平均':>8}  调用方法 / 命令 / 定位符"]
+        for row in self.hotspots(limit):
+            target = f"{row['caller']} / {row['command']}"
+            if row['locator']:
+                target += f" / {row['locator']}"
+            lines.append(f"{row['total']:8.3f}s {row['count']:6d} {row['avg']:7.3f}s  {target}")
+        return "\n".join(lines)
+
+    def write_json(self, path: str) -> None:
+        """输出所有测试的耗时分解和热点表"""
+        tests = sorted({r['test'] for r in self.records if r['test']})
+        data = {
+            'tests': {nodeid: self.test_breakdown(nodeid) for nodeid in tests},
+            'hotspots': self.hotspots(limit=100),
+        }
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        Path(path).write_text(json.dumps(data, ensure_ascii=False, indent=2), encoding='utf-8')
+
+    def _append(self, command: str, locator: Optional[str], seconds: float, caller: str, in_wait: bool) -> None:
+        with self._lock:
+            self.records.append({
+                'test': self.current_test,
+                'command': command,
+                'locator': locator,
+                'seconds': seconds,
+                'caller': caller,
+                'in_wait': in_wait,
+            })
+
+    def _patch_waits(self) -> None:
+        """包装WebDriverWait，记录等待的总耗时"""
+        if self._wait_patched:
+            return
+        self._wait_patched = True
+        timer = self
+
+        def timed(original):
+            def wrapper(wait_self, method, message=""):
+                start = time.perf_counter()
+                try:
+                    return original(wait_self, method, message)
+                finally:
+                    caller, _ = timer._caller()
+                    timer._append('wait', None, time.perf_counter() - start, caller, False)
+            return wrapper
+
+        WebDriverWait.until = timed(WebDriverWait.until)
+        WebDriverWait.until_not = timed(WebDriverWait.until_not)
+
+    @staticmethod
+    def _caller() -> tuple:
+        """
+        查找调用命令的页面对象方法，返回 (方法名, 是否在WebDriverWait轮询中)
+
+        优先取最靠近命令的非BasePage页面对象方法，找不到时取BasePage方法，
+        都找不到时（测试直接调用driver）取测试函数名。
+        """
+        frame = sys._getframe(2)
+        base_page_caller = None
+        other_caller = None
+        in_wait = False
+        while frame is not None:
+            filename = frame.f_code.co_filename
+            # 页面方法内的lambda（如等待条件）归属到外层方法
+            name = getattr(frame.f_code, 'co_qualname', frame.f_code.co_name).split('.<locals>')[0]
+            if filename.endswith(os.path.join('support', 'wait.py')):
+                in_wait = True
+            elif filename.startswith(PAGES_DIR):
+                if filename != _BASE_PAGE_FILE:
+                    return name, in_wait
+                if base_page_caller is None:
+                    base_page_caller = name
+            elif other_caller is None and frame.f_code.co_name.startswith('test_'):
+                other_caller = name
+            frame = frame.f_back
+        return base_page_caller or other_caller or '(other)', in_wait
+
+    @staticmethod
+    def _category(record: Dict[str, Any]) -> str:
+        command = record['command']
+        if command == 'startup':
+            return 'startup'
+        if command == 'wait':
+            # 等待的总耗时，包含其中的轮询命令
+            return 'wait_total'
+        if command in _NAVIGATION_COMMANDS:
+            return 'navigation'
+        if command in _FIND_COMMANDS:
+            return 'polling' if record['in_wait'] else 'find'
+        if command in _SCRIPT_COMMANDS:
+            return 'script'
+        return 'element'
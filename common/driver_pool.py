@@ -0,0 +1,239 @@
+import os
+import threading
+import time
+import weakref
+from typing import Dict, List
+from urllib.parse import urlparse
+
+from selenium import webdriver
+from selenium.common.exceptions import NoAlertPresentException, WebDriverException
+from selenium.webdriver.chrome.service import Service
+from selenium.webdriver.chrome.options import Options
+
+CHROMEDRIVER_PATH = r'C:\Users\seeki\AppData\Local\Programs\Python\Python312\chromedriver.exe'
+
+# 并行模式下由run.py为每个工作进程设置的环境变量
+WORKER_ID_ENV = 'TEST_WORKER_ID'
+
+
+# 性能配置：default保持浏览器默认行为；fast使用eager加载策略并屏蔽测试不关心的资源
+# PAGE_LOAD_STRATEGY和BLOCK_RESOURCES环境变量可以单独覆盖
+PERF_PROFILES = {
+    'default': {'page_load_strategy': 'normal', 'block_resources': False},
+    'fast': {'page_load_strategy': 'eager', 'block_resources': True},
+}
+
+# 屏蔽的资源：图片、字体和第三方统计脚本
+BLOCKED_URL_PATTERNS = [
+    '*.png', '*.jpg', '*.jpeg', '*.gif', '*.webp', '*.svg', '*.ico',
+    '*.woff', '*.woff2', '*.ttf', '*.otf', '*.eot',
+    '*google-analytics.com*', '*googletagmanager.com*',
+]
+
+
+def get_perf_settings() -> Dict[str, object]:
+    """根据PERF_PROFILE及覆盖用的环境变量返回性能设置"""
+    profile_name = os.getenv('PERF_PROFILE', 'default').lower()
+    if profile_name not in PERF_PROFILES:
+        raise ValueError(f"未知的PERF_PROFILE: {profile_name}，可选值: {list(PERF_PROFILES)}")
+    settings = dict(PERF_PROFILES[profile_name])
+
+    page_load_strategy = os.getenv('PAGE_LOAD_STRATEGY')
+    if page_load_strategy:
+        settings['page_load_strategy'] = page_load_strategy.lower()
+    block_resources = os.getenv('BLOCK_RESOURCES')
+    if block_resources:
+        settings['block_resources'] = block_resources.lower() == 'true'
+    return settings
+
+
+# 每个浏览器当前的资源屏蔽设置，供新窗口重新应用
+_blocking_enabled: "weakref.WeakKeyDictionary[webdriver.Chrome, bool]" = weakref.WeakKeyDictionary()
+
+
+def set_resource_blocking(driver: webdriver.Chrome, enabled: bool) -> None:
+    """
+    通过CDP开启或关闭当前标签页的资源屏蔽，并记录为该浏览器的设置
+
+    Network.setBlockedURLs只对执行命令时的标签页生效。测试代码打开的新窗口
+    切换过去后调用apply_resource_blocking；页面链接（target=_blank）打开的窗口
+    在切换过去之前已经开始加载，其第一个页面不受屏蔽。
+    """
+    _blocking_enabled[driver] = enabled
+    _send_blocked_urls(driver, enabled)
+
+
+def apply_resource_blocking(driver: webdriver.Chrome) -> None:
+    """在当前窗口中应用该浏览器的资源屏蔽设置，未开启屏蔽时不执行任何命令"""
+    if _blocking_enabled.get(driver):
+        _send_blocked_urls(driver, True)
+
+
+def _send_blocked_urls(driver: webdriver.Chrome, enabled: bool) -> None:
+    driver.execute_cdp_cmd('Network.enable', {})
+    driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': BLOCKED_URL_PATTERNS if enabled else []})
+
+
+def get_worker_id() -> str:
+    """获取当前工作进程ID，串行运行时返回'main'"""
+    return os.getenv(WORKER_ID_ENV, 'main')
+
+
+def create_chrome_driver() -> webdriver.Chrome:
+    """创建Chrome WebDriver实例"""
+    service = Service(CHROMEDRIVER_PATH)
+
+    # 设置Chrome选项
+    chrome_options = Options()
+    chrome_options.page_load_strategy = get_perf_settings()['page_load_strategy']
+    chrome_options.add_argument('--window-size=1920,1080')
+    chrome_options.add_experimental_option('prefs', {
+        'credentials_enable_service': False,
+        'profile.password_manager_enabled': False,
+        'profile.password_manager_leak_detection': False
+    })
+
+    # 检查无头模式的环境变量
+    github_actions = os.getenv('GITHUB_ACTIONS', 'false').lower() == 'true'
+    remote_containers = os.getenv('REMOTE_CONTAINERS', 'false').lower() == 'true'
+    codespaces = os.getenv('CODESPACES', 'false').lower() == 'true'
+    # 并行模式下多个浏览器窗口同时弹出没有意义，统一使用无头模式
+    parallel_worker = os.getenv(WORKER_ID_ENV) is not None
+
+    if github_actions or parallel_worker:
+        chrome_options.add_argument('--headless')
+    elif remote_containers or codespaces:
+        chrome_options.add_argument('--headless')
+        chrome_options.add_argument('--no-sandbox')
+
+    return webdriver.Chrome(service=service, options=chrome_options)
+
+
+class DriverPool:
+    """
+    工作进程内的WebDriver池
+
+    每个工作进程持有一个池，通过acquire获取浏览器、release归还，
+    浏览器在整个进程生命周期内复用，直到close时统一退出。
+    测试之间通过reset恢复浏览器状态，代替重新启动浏览器。
+    """
+
+    def __init__(self):
+        self.block_resources = bool(get_perf_settings()['block_resources'])
+        self._idle: List[webdriver.Chrome] = []
+        self._all: List[webdriver.Chrome] = []
+        # 每个浏览器的启动耗时（秒）
+        self.startup_seconds: Dict[webdriver.Chrome, float] = {}
+        # 每个浏览器的主窗口句柄，reset时关闭其他窗口并切换回主窗口
+        self._main_handles: Dict[webdriver.Chrome, str] = {}
+        self._lock = threading.Lock()
+
+    def acquire(self) -> webdriver.Chrome:
+        """从池中获取一个浏览器，池为空时新建"""
+        with self._lock:
+            if self._idle:
+                return self._idle.pop()
+        start = time.perf_counter()
+        driver = create_chrome_driver()
+        with self._lock:
+            self.startup_seconds[driver] = time.perf_counter() - start
+            self._all.append(driver)
+            self._main_handles[driver] = driver.current_window_handle
+        if self.block_resources:
+            set_resource_blocking(driver, True)
+        return driver
+
+    def reset(self, driver: webdriver.Chrome, base_url: str, full: bool = False) -> None:
+        """
+        恢复浏览器状态
+
+        Args:
+            driver: 要恢复的浏览器
+            base_url: 被测站点地址，用于确定要清除存储的源
+            full: False时关闭弹窗、多余窗口并清除当前域cookies（测试之间）；
+                  True时相当于重新启动浏览器，额外清除所有cookies、
+                  localStorage和sessionStorage（测试类之间）
+        """
+        self._dismiss_alert(driver)
+
+        if full:
+            # 在新标签页中重新开始，旧标签页的sessionStorage随标签页一起销毁
+            driver.switch_to.new_window('tab')
+            main_handle = driver.current_window_handle
+            self._main_handles[driver] = main_handle
+            self._close_other_windows(driver)
+            # 资源屏蔽只对设置时的标签页生效，需要在新标签页中重新设置
+            apply_resource_blocking(driver)
+
+            driver.execute_cdp_cmd('Network.clearBrowserCookies', {})
+            parsed = urlparse(base_url)
+            driver.execute_cdp_cmd('Storage.clearDataForOrigin', {
+                'origin': f"{parsed.scheme}://{parsed.netloc}",
+                'storageTypes': 'all'
+            })
+        else:
+            self._close_other_windows(driver)
+            driver.delete_all_cookies()
+
+    @staticmethod
+    def _dismiss_alert(driver: webdriver.Chrome) -> None:
+        """关闭测试残留的弹窗"""
+        try:
+            driver.switch_to.alert.dismiss()
+        except NoAlertPresentException:
+            pass
+
+    def _close_other_windows(self, driver: webdriver.Chrome) -> None:
+        """关闭主窗口以外的所有窗口并切换回主窗口"""
+        handles = driver.window_handles
+        main_handle = self._main_handles.get(driver)
+        if main_handle not in handles:
+            # 主窗口已被测试关闭，改用剩余的第一个窗口作为主窗口
+            main_handle = handles[0]
+            self._main_handles[driver] = main_handle
+
+        for handle in handles:
+            if handle == main_handle:
+                continue
+            try:
+                driver.switch_to.window(handle)
+                driver.close()
+            except WebDriverException:
+                continue  # 窗口可能已关闭，忽略
+        driver.switch_to.window(main_handle)
+        driver.switch_to.default_content()
+
+    def release(self, driver: webdriver.Chrome) -> None:
+        """归还浏览器，清除cookies后放回池中"""
+        try:
+            driver.delete_all_cookies()
+        except Exception:
+            # 浏览器已失效，直接丢弃
+            self._discard(driver)
+            return
+        with self._lock:
+            self._idle.append(driver)
+
+    def close(self) -> None:
+        """退出池中所有浏览器"""
+        with self._lock:
+            drivers, self._all, self._idle = self._all, [], []
+            self._main_handles.clear()
+            self.startup_seconds.clear()
+        for driver in drivers:
+            try:
+                driver.quit()
+            except Exception:
+                continue
+
+    def _discard(self, driver: webdriver.Chrome) -> None:
+        """丢弃失效的浏览器"""
+        with self._lock:
+            if driver in self._all:
+                self._all.remove(driver)
+            self._main_handles.pop(driver, None)
+            self.startup_seconds.pop(driver, None)
+        try:
+            driver.quit()
+        except Exception:
+            pass
@@ -0,0 +1,91 @@
+"""
+测试耗时数据库
+
+记录每个测试（setup + call + teardown）的历史耗时，供并行运行时按耗时分配测试。
+每个进程只写自己的文件 durations-<工作进程ID>.json，避免并行写入冲突；
+下次读取时合并到 durations.json 并删除进程文件。
+同一测试的多次耗时按指数移动平均合并，偶尔一次的慢运行不会让估计值大幅波动。
+"""
+import json
+import os
+import statistics
+from pathlib import Path
+from typing import Dict, Iterable, Optional
+
+DURATIONS_DIR = Path('reports') / 'durations'
+DATABASE_NAME = 'durations.json'
+# 新耗时在移动平均中的权重
+SMOOTHING = 0.5
+# 没有任何历史数据时每个测试的估计耗时（秒）
+DEFAULT_SECONDS = 1.0
+
+
+class DurationStore:
+    """测试耗时的读取、记录和估计"""
+
+    def __init__(self, directory: Path = DURATIONS_DIR):
+        self.directory = Path(directory)
+        self.database_path = self.directory / DATABASE_NAME
+        self._durations: Optional[Dict[str, float]] = None
+
+    def _worker_files(self) -> Iterable[Path]:
+        if not self.directory.is_dir():
+            return []
+        return sorted(path for path in self.directory.glob('durations-*.json'))
+
+    @staticmethod
+    def _read(path: Path) -> Dict[str, float]:
+        try:
+            return json.loads(path.read_text(encoding='utf-8'))
+        except (OSError, ValueError):
+            return {}
+
+    def _write(self, path: Path, durations: Dict[str, float]) -> None:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix('.tmp')
+        tmp_path.write_text(json.dumps(durations, ensure_ascii=False, indent=2, sort_keys=True), encoding='utf-8')
+        os.replace(tmp_path, path)
+
+    def record(self, worker_id: str, durations: Dict[str, float]) -> None:
+        """写入一个进程本次运行的测试耗时"""
+        if durations:
+            self._write(self.directory / f"durations-{worker_id}.json", durations)
+
+    def merge(self) -> Dict[str, float]:
+        """把各进程的耗时文件合并到数据库，返回合并后的全部耗时"""
+        durations = self._read(self.database_path) if self.database_path.exists() else {}
+        worker_files = list(self._worker_files())
+        for path in worker_files:
+            for node_id, seconds in self._read(path).items():
+                previous = durations.get(node_id)
+                durations[node_id] = seconds if previous is None else previous + SMOOTHING * (seconds - previous)
+        if worker_files:
+            self._write(self.database_path, durations)
+            for path in worker_files:
+                path.unlink(missing_ok=True)
+        self._durations = durations
+        return durations
+
+    @property
+    def durations(self) -> Dict[str, float]:
+        if self._durations is None:
+            self.merge()
+        return self._durations
+
+    def estimate(self, node_id: str) -> float:
+        """
+        估计测试耗时
+
+        没有记录时依次使用：同一测试函数其他参数的耗时中位数、所有测试的耗时中位数、默认值
+        """
+        durations = self.durations
+        if node_id in durations:
+            return durations[node_id]
+
+        function_id = node_id.split('[', 1)[0]
+        siblings = [seconds for other, seconds in durations.items() if other.split('[', 1)[0] == function_id]
+        if siblings:
+            return statistics.median(siblings)
+        if durations:
+            return statistics.median(durations.values())
+        return DEFAULT_SECONDS
@@ -0,0 +1,458 @@
+"""
+测试影响分析
+
+用AST建立依赖图，根据git中变更的文件只选出受影响的测试：
+    测试函数 -> 使用的页面类/方法（包括导航方法中延迟导入的页面，如go_to_icon_page -> IconPage）
+    页面方法 -> 所在模块（定位符等模块级定义）、调用的其他页面方法
+    测试函数 -> 参数化引用的YAML数据文件 -> 数据文件引用的资源文件
+common/和conftest.py按文件粒度处理（文件依赖其中所有函数引用的页面）；conftest.py对所有测试生效。
+
+每个文件的分析结果按修改时间和大小缓存在 .impact_cache/ 中，只重新分析变化的文件。
+
+    python -m common.impact            # 列出相对于HEAD（含未提交修改）受影响的测试
+    python -m common.impact main       # 相对于与main分支的分叉点
+"""
+import argparse
+import ast
+import json
+import re
+import subprocess
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+CACHE_FILE = PROJECT_ROOT / '.impact_cache' / 'graph.json'
+
+# 参与分析的源码目录；页面和测试按函数粒度，其他按文件粒度
+SOURCE_DIRS = ('pages', 'testcase', 'common')
+FUNCTION_LEVEL_DIRS = ('pages', 'testcase')
+DATA_DIR = 'data'
+# 对所有测试生效的文件，变化时运行全部测试
+GLOBAL_FILES = ('conftest.py', 'pytest.ini', 'requirements.txt')
+
+# 分析结果格式变化时递增，使旧缓存失效
+_CACHE_VERSION = 2
+
+# 代码中的数据文件路径字符串，以及数据文件中引用其他数据文件的位置
+_DATA_PATH = re.compile(r'^(?:\.\.?/)*(data/[\w./-]+)$')
+_DATA_REFERENCE = re.compile(r'''(?:^|["'\s])((?:\.\.?/)*data/[\w./-]+)''')
+
+
+def _module_path(module: str) -> Optional[str]:
+    """把模块名转换为项目内的文件路径，不是项目内模块时返回None"""
+    path = Path(*module.split('.'))
+    for candidate in (path.with_suffix('.py'), path / '__init__.py'):
+        if (PROJECT_ROOT / candidate).exists():
+            return candidate.as_posix()
+    return None
+
+
+def _data_path(reference: str) -> Optional[str]:
+    """把代码或数据中的数据文件引用（如 ../data/login_cases.yaml）转换为项目内路径"""
+    match = _DATA_PATH.match(reference.replace('\\', '/'))
+    if not match:
+        return None
+    path = match.group(1)
+    return path if (PROJECT_ROOT / path).is_file() else None
+
+
+class _FunctionVisitor(ast.NodeVisitor):
+    """收集一个函数（包括装饰器）引用的名称、属性和数据文件"""
+
+    def __init__(self):
+        self.names: Set[str] = set()
+        # 所属对象不是简单名称的属性，如 self.driver.get 中的 get
+        self.attributes: Set[str] = set()
+        # 名称.属性，如 IconPage.open、self.get_text、my_page.go_to_icon_page、super.__init__
+        self.qualified: Set[str] = set()
+        self.data_files: Set[str] = set()
+        # 函数内延迟导入：名称 -> "模块路径::名称"
+        self.imports: Dict[str, str] = {}
+
+    def visit_Name(self, node: ast.Name):
+        self.names.add(node.id)
+
+    def visit_Attribute(self, node: ast.Attribute):
+        value = node.value
+        if isinstance(value, ast.Name):
+            self.qualified.add(f"{value.id}.{node.attr}")
+        elif isinstance(value, ast.Call) and isinstance(value.func, ast.Name) and value.func.id == 'super':
+            self.qualified.add(f"super.{node.attr}")
+        else:
+            self.attributes.add(node.attr)
+        self.generic_visit(node)
+
+    def visit_Constant(self, node: ast.Constant):
+        if isinstance(node.value, str):
+            path = _data_path(node.value)
+            if path:
+                self.data_files.add(path)
+
+    def visit_ImportFrom(self, node: ast.ImportFrom):
+        _record_import(node, self.imports)
+
+    def visit_Import(self, node: ast.Import):
+        _record_import(node, self.imports)
+
+
+def _record_import(node, imports: Dict[str, str]) -> None:
+    if isinstance(node, ast.ImportFrom) and node.module:
+        module_path = _module_path(node.module)
+        if module_path:
+            for alias in node.names:
+                imports[alias.asname or alias.name] = f"{module_path}::{alias.name}"
+    elif isinstance(node, ast.Import):
+        for alias in node.names:
+            module_path = _module_path(alias.name)
+            if module_path:
+                imports[alias.asname or alias.name.split('.')[0]] = f"{module_path}::"
+
+
+def _function_facts(node: ast.AST) -> Dict[str, List[str]]:
+    visitor = _FunctionVisitor()
+    for decorator in getattr(node, 'decorator_list', []):
+        visitor.visit(decorator)
+    for child in node.body:
+        visitor.visit(child)
+    return {
+        'names': sorted(visitor.names),
+        'attributes': sorted(visitor.attributes),
+        'qualified': sorted(visitor.qualified),
+        'data_files': sorted(visitor.data_files),
+        'imports': visitor.imports,
+    }
+
+
+def analyze_file(path: str) -> Dict:
+    """分析一个Python文件：顶层导入、类（含基类）及每个函数的引用"""
+    tree = ast.parse((PROJECT_ROOT / path).read_text(encoding='utf-8'), filename=path)
+    imports: Dict[str, str] = {}
+    classes: Dict[str, Dict] = {}
+    functions: Dict[str, Dict] = {}
+    module_data: Set[str] = set()
+    # 模块级对象 -> 构造它的类名，如 _driver_pool = DriverPool()
+    instances: Dict[str, str] = {}
+
+    for node in tree.body:
+        if isinstance(node, (ast.Import, ast.ImportFrom)):
+            _record_import(node, imports)
+        elif isinstance(node, ast.ClassDef):
+            methods = {}
+            for item in node.body:
+                if isinstance(item, (ast.FunctionDef, ast.AsyncFunctionDef)):
+                    methods[item.name] = _function_facts(item)
+            classes[node.name] = {
+                'bases': [base.id for base in node.bases if isinstance(base, ast.Name)],
+                'methods': methods,
+            }
+        elif isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            functions[node.name] = _function_facts(node)
+        else:
+            if (isinstance(node, ast.Assign) and isinstance(node.value, ast.Call)
+                    and isinstance(node.value.func, ast.Name)):
+                for target in node.targets:
+                    if isinstance(target, ast.Name):
+                        instances[target.id] = node.value.func.id
+            for child in ast.walk(node):
+                if isinstance(child, ast.Constant) and isinstance(child.value, str):
+                    data_path = _data_path(child.value)
+                    if data_path:
+                        module_data.add(data_path)
+
+    return {
+        'imports': imports,
+        'classes': classes,
+        'functions': functions,
+        'instances': instances,
+        'data_files': sorted(module_data),
+    }
+
+
+def analyze_data_file(path: str) -> Dict:
+    """分析数据文件引用的其他数据文件（如图标测试用到的图片）"""
+    text = (PROJECT_ROOT / path).read_text(encoding='utf-8', errors='ignore')
+    references = {_data_path(match.group(1)) for match in _DATA_REFERENCE.finditer(text)}
+    references.discard(None)
+    references.discard(path)
+    return {'data_files': sorted(references)}
+
+
+class DependencyGraph:
+    """
+    测试依赖图
+
+    节点为文件（"路径"）、类（"路径::类名"）和函数（"路径::类名.方法名" 或 "路径::函数名"），
+    边指向节点依赖的其他节点。
+    """
+
+    def __init__(self, facts: Dict[str, Dict]):
+        self.facts = facts
+        self.edges: Dict[str, Set[str]] = {}
+        # 页面方法名 -> 定义该方法的函数节点，用于解析无法确定类型的属性调用
+        self._methods_by_name: Dict[str, Set[str]] = {}
+        self._build()
+
+    # ================== 建图 ==================
+
+    def _build(self) -> None:
+        for path, facts in self.facts.items():
+            for class_name, class_facts in facts.get('classes', {}).items():
+                class_node = f"{path}::{class_name}"
+                if path.startswith(FUNCTION_LEVEL_DIRS):
+                    for method in class_facts['methods']:
+                        self._methods_by_name.setdefault(method, set()).add(f"{class_node}.{method}")
+
+        for path, facts in self.facts.items():
+            self.edges.setdefault(path, set()).update(facts.get('data_files', []))
+            if not path.endswith('.py'):
+                continue
+            for target in facts['imports'].values():
+                self.edges[path].add(self._import_node(target))
+            # conftest.py中的fixture对所有测试生效
+            if path.startswith('testcase/') and 'conftest.py' in self.facts:
+                self.edges[path].add('conftest.py')
+
+            function_level = path.startswith(FUNCTION_LEVEL_DIRS)
+            for class_name, class_facts in facts['classes'].items():
+                class_node = f"{path}::{class_name}"
+                self.edges.setdefault(class_node, set()).add(path)
+                for base in class_facts['bases']:
+                    base_node = self._resolve_name(base, facts['imports'], path)
+                    if base_node:
+                        self.edges[class_node].add(base_node)
+                if not function_level:
+                    # 按文件粒度：方法中延迟导入和调用的页面都算作文件的依赖
+                    for method, method_facts in class_facts['methods'].items():
+                        self._add_file_level_function(f"{class_node}.{method}", method_facts, path, class_name)
+                    continue
+                # 构造类时执行__init__
+                if '__init__' in class_facts['methods']:
+                    self.edges[class_node].add(f"{class_node}.__init__")
+                for method, method_facts in class_facts['methods'].items():
+                    self._add_function(f"{class_node}.{method}", method_facts, path, class_name)
+
+            for function, function_facts in facts['functions'].items():
+                node = f"{path}::{function}"
+                if function_level:
+                    self._add_function(node, function_facts, path, None)
+                else:
+                    self._add_file_level_function(node, function_facts, path, None)
+
+    def _add_file_level_function(self, node: str, facts: Dict, path: str, class_name: Optional[str]) -> None:
+        """common/和conftest.py中的函数：文件依赖函数引用的所有节点，修改文件中任一处都视为修改了整个文件"""
+        self._add_function(node, facts, path, class_name)
+        self.edges[path].add(node)
+
+    def _add_function(self, node: str, facts: Dict, path: str, class_name: Optional[str]) -> None:
+        edges = self.edges.setdefault(node, {path})
+        if class_name:
+            class_node = f"{path}::{class_name}"
+            edges.add(class_node)
+            if path.startswith('testcase'):
+                # 测试依赖所在类的fixture和辅助方法
+                for method in self.facts[path]['classes'][class_name]['methods']:
+                    if not method.startswith('test_'):
+                        edges.add(f"{class_node}.{method}")
+
+        imports = dict(self.facts[path]['imports'], **facts['imports'])
+        edges.update(self._import_node(target) for target in facts['imports'].values())
+        edges.update(facts['data_files'])
+
+        for name in facts['names']:
+            resolved = self._resolve_name(name, imports, path)
+            if resolved:
+                edges.add(resolved)
+
+        unresolved = set(facts['attributes'])
+        for qualified in facts['qualified']:
+            owner, attribute = qualified.split('.', 1)
+            if owner in ('self', 'cls') and class_name:
+                # 类中找不到时是实例属性（如self.driver），不按方法名匹配
+                target = self._find_method(f"{path}::{class_name}", attribute)
+            elif owner == 'super' and class_name:
+                target = self._find_base_method(path, class_name, attribute)
+            elif owner in self.facts[path].get('instances', {}):
+                # 模块级对象，按其类查找方法
+                owner_class = self._resolve_name(self.facts[path]['instances'][owner], imports, path)
+                target = self._find_method(owner_class, attribute) if owner_class else None
+            else:
+                owner_node = self._resolve_name(owner, imports, path)
+                target = self._find_method(owner_node, attribute) if owner_node else None
+                if owner_node is None:
+                    unresolved.add(attribute)
+            if target:
+                edges.add(target)
+
+        # 类型未知的对象（如 my_page.go_to_icon_page()）按方法名匹配所有页面类
+        for attribute in unresolved:
+            edges.update(self._methods_by_name.get(attribute, ()))
+
+    def _find_base_method(self, path: str, class_name: str, method: str) -> Optional[str]:
+        """在基类中查找方法（super()调用）"""
+        facts = self.facts[path]
+        for base in facts['classes'][class_name]['bases']:
+            base_node = self._resolve_name(base, facts['imports'], path)
+            target = self._find_method(base_node, method) if base_node else None
+            if target:
+                return target
+        return None
+
+    def _import_node(self, target: str) -> str:
+        """导入目标 "模块路径::名称" -> 类节点或文件节点"""
+        module_path, name = target.split('::', 1)
+        if name and name in self.facts.get(module_path, {}).get('classes', {}):
+            return f"{module_path}::{name}"
+        return module_path
+
+    def _resolve_name(self, name: str, imports: Dict[str, str], path: str) -> Optional[str]:
+        if name in imports:
+            return self._import_node(imports[name])
+        facts = self.facts.get(path, {})
+        if name in facts.get('classes', {}):
+            return f"{path}::{name}"
+        if name in facts.get('functions', {}):
+            return f"{path}::{name}"
+        return None
+
+    def _find_method(self, class_node: str, method: str) -> Optional[str]:
+        """在类及其基类中查找方法节点"""
+        seen = set()
+        pending = [class_node]
+        while pending:
+            node = pending.pop()
+            if node in seen or '::' not in node:
+                continue
+            seen.add(node)
+            path, class_name = node.split('::', 1)
+            class_facts = self.facts.get(path, {}).get('classes', {}).get(class_name)
+            if class_facts is None:
+                continue
+            if method in class_facts['methods']:
+                return f"{node}.{method}" if path.startswith(FUNCTION_LEVEL_DIRS) else path
+            pending.extend(
+                base_node for base_node in (self._resolve_name(base, self.facts[path]['imports'], path)
+                                            for base in class_facts['bases']) if base_node
+            )
+        return None
+
+    # ================== 查询 ==================
+
+    def tests(self) -> List[str]:
+        """所有测试函数节点"""
+        return sorted(
+            node for node in self.edges
+            if node.startswith('testcase/') and '::' in node
+            and node.split('::', 1)[1].split('.')[-1].startswith('test_')
+        )
+
+    def dependencies(self, node: str) -> Set[str]:
+        """节点的传递依赖（包括自身）"""
+        seen = set()
+        pending = [node]
+        while pending:
+            current = pending.pop()
+            if current in seen:
+                continue
+            seen.add(current)
+            pending.extend(self.edges.get(current, ()))
+        return seen
+
+    def impacted_tests(self, changed_files: Iterable[str]) -> List[str]:
+        """返回受变更文件影响的测试，格式为pytest节点ID（如 testcase/test_login.py::TestLogin::test_login_success）"""
+        changed = {Path(path).as_posix() for path in changed_files}
+        if changed & set(GLOBAL_FILES):
+            selected = self.tests()
+        else:
+            selected = [
+                test for test in self.tests()
+                if any(dependency.split('::', 1)[0] in changed for dependency in self.dependencies(test))
+            ]
+        return [_to_node_id(test) for test in selected]
+
+
+def _to_node_id(node: str) -> str:
+    """图节点 "路径::类.方法" -> pytest节点ID "路径::类::方法" """
+    path, name = node.split('::', 1)
+    return f"{path}::{name.replace('.', '::')}"
+
+
+def _source_files() -> List[str]:
+    files = [name for name in GLOBAL_FILES if name.endswith('.py') and (PROJECT_ROOT / name).exists()]
+    for directory in SOURCE_DIRS:
+        files.extend(path.relative_to(PROJECT_ROOT).as_posix() for path in (PROJECT_ROOT / directory).rglob('*.py'))
+    for path in (PROJECT_ROOT / DATA_DIR).glob('*.y*ml'):
+        files.append(path.relative_to(PROJECT_ROOT).as_posix())
+    return sorted(files)
+
+
+def build_graph(cache_file: Optional[Path] = CACHE_FILE) -> DependencyGraph:
+    """建立依赖图，只重新分析修改时间或大小变化的文件"""
+    cached: Dict[str, Dict] = {}
+    if cache_file and cache_file.exists():
+        try:
+            data = json.loads(cache_file.read_text(encoding='utf-8'))
+            if data.get('version') == _CACHE_VERSION:
+                cached = data['files']
+        except ValueError:
+            cached = {}
+
+    files: Dict[str, Dict] = {}
+    for path in _source_files():
+        stat = (PROJECT_ROOT / path).stat()
+        signature = [stat.st_mtime_ns, stat.st_size]
+        entry = cached.get(path)
+        if entry is None or entry['signature'] != signature:
+            facts = analyze_file(path) if path.endswith('.py') else analyze_data_file(path)
+            entry = {'signature': signature, 'facts': facts}
+        files[path] = entry
+
+    if cache_file and files != cached:
+        cache_file.parent.mkdir(parents=True, exist_ok=True)
+        cache_file.write_text(json.dumps({'version': _CACHE_VERSION, 'files': files}), encoding='utf-8')
+
+    return DependencyGraph({path: entry['facts'] for path, entry in files.items()})
+
+
+def changed_files(base: str = 'HEAD') -> List[str]:
+    """
+    获取相对于base的变更文件（包括未提交的修改和未跟踪的文件），路径相对于项目根目录
+
+    base不是HEAD时使用与当前分支的分叉点，只包含当前分支上的修改
+    """
+    def git(*args: str) -> str:
+        return subprocess.run(['git', *args], cwd=PROJECT_ROOT, check=True,
+                              capture_output=True, text=True).stdout
+
+    top_level = Path(git('rev-parse', '--show-toplevel').strip())
+    if base != 'HEAD':
+        base = git('merge-base', base, 'HEAD').strip()
+    names = git('diff', '--name-only', base).splitlines()
+    names += git('ls-files', '--others', '--exclude-standard', '--full-name').splitlines()
+
+    files = []
+    for name in names:
+        try:
+            files.append((top_level / name).resolve().relative_to(PROJECT_ROOT).as_posix())
+        except ValueError:
+            # 项目目录之外的文件
+            continue
+    return sorted(set(files))
+
+
+def impacted_tests(base: str = 'HEAD') -> List[str]:
+    """相对于base受影响的测试节点ID"""
+    return build_graph().impacted_tests(changed_files(base))
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="列出受变更影响的测试")
+    parser.add_argument('base', nargs='?', default='HEAD', help="比较的基准（默认HEAD，即未提交的修改）")
+    args = parser.parse_args()
+
+    changed = changed_files(args.base)
+    print("变更文件:")
+    for path in changed:
+        print(f"  {path}")
+    print("受影响的测试:")
+    for test in build_graph().impacted_tests(changed):
+        print(f"  {test}")
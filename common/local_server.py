@@ -0,0 +1,183 @@
+"""
+本地HOTEL PLANISPHERE站点
+
+用本地静态镜像代替公网站点，页面加载只走回环网络，并且可以离线运行。
+镜像目录默认为 data/site，目录结构与站点URL路径一致（如 data/site/en-US/index.html）。
+
+镜像不随仓库提交，首次使用前在能访问公网站点的环境中生成（见README“使用本地站点”）：
+    python -m common.local_server --mirror
+
+下载失败的文件会被跳过并在结束时列出，缺少页面时镜像不可用，测试自动退回到公网站点。
+"""
+import argparse
+import functools
+import re
+import threading
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import List, NamedTuple, Optional, Set
+from urllib.parse import urljoin, urlparse
+from urllib.request import urlopen
+
+SITE_URL = 'https://hotel-example-site.takeyaqa.dev/en-US'
+SITE_DIR = Path(__file__).resolve().parent.parent / 'data' / 'site'
+
+# 页面对象用到的页面
+SITE_PAGES = [
+    'index.html', 'login.html', 'signup.html', 'mypage.html', 'plans.html',
+    'reserve.html', 'confirm.html', 'icon.html', 'room.html',
+]
+
+# 页面和样式中引用的资源
+_RESOURCE_PATTERN = re.compile(r'''(?:src|href)=["']([^"'#]+)["']|url\(["']?([^"')#]+)["']?\)''')
+# 脚本中以字符串字面量引用的资源（import、fetch、动态创建的img等）
+_SCRIPT_RESOURCE_PATTERN = re.compile(
+    r'''["'`]((?:\.{0,2}/)?[\w@./-]+\.(?:m?js|css|json|png|jpe?g|gif|webp|svg|ico|woff2?|ttf|otf|eot))["'`]'''
+)
+
+
+class _QuietHandler(SimpleHTTPRequestHandler):
+    """不输出访问日志的静态文件处理器"""
+
+    # Windows注册表可能把.js映射为text/plain，导致模块脚本无法加载
+    extensions_map = {
+        **SimpleHTTPRequestHandler.extensions_map,
+        '.js': 'text/javascript',
+        '.mjs': 'text/javascript',
+        '.css': 'text/css',
+        '.json': 'application/json',
+        '.svg': 'image/svg+xml',
+        '.woff2': 'font/woff2',
+    }
+
+    def log_message(self, format, *args):
+        pass
+
+
+class LocalSiteServer:
+    """在后台线程中运行的本地静态站点服务器"""
+
+    def __init__(self, site_dir: Path = SITE_DIR, host: str = '127.0.0.1', port: int = 0):
+        self.site_dir = Path(site_dir)
+        self.host = host
+        self.port = port
+        self._server: Optional[ThreadingHTTPServer] = None
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def base_url(self) -> str:
+        """与Utils.BASE_URL对应的本地地址"""
+        return f"http://{self.host}:{self.port}{urlparse(SITE_URL).path}"
+
+    def is_available(self) -> bool:
+        """检查镜像是否已生成"""
+        locale_dir = self.site_dir / urlparse(SITE_URL).path.strip('/')
+        return all((locale_dir / page).exists() for page in SITE_PAGES)
+
+    def start(self) -> str:
+        """启动服务器并返回站点地址，port为0时自动选择空闲端口"""
+        if not self.is_available():
+            raise FileNotFoundError(f"本地站点镜像不存在，请先运行 python -m common.local_server --mirror: {self.site_dir}")
+
+        handler = functools.partial(_QuietHandler, directory=str(self.site_dir))
+        self._server = ThreadingHTTPServer((self.host, self.port), handler)
+        self.port = self._server.server_address[1]
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self.base_url
+
+    def stop(self) -> None:
+        """停止服务器"""
+        if self._server:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+            self._thread = None
+
+
+class MirrorResult(NamedTuple):
+    """镜像结果"""
+    saved: List[str]
+    failed: List[str]
+
+
+def _references(url: str, suffix: str, text: str) -> List[str]:
+    """文件中引用的资源URL"""
+    if suffix in ('.html', '.css'):
+        references = [match.group(1) or match.group(2) for match in _RESOURCE_PATTERN.finditer(text)]
+    elif suffix in ('.js', '.mjs'):
+        references = [match.group(1) for match in _SCRIPT_RESOURCE_PATTERN.finditer(text)]
+    else:
+        return []
+
+    urls = []
+    for reference in references:
+        if reference.startswith(('data:', 'javascript:', 'mailto:')):
+            continue
+        resource_url = urljoin(url, reference).split('?', 1)[0]
+        # 其他页面（如其他语言版本）不需要镜像
+        if resource_url.endswith(('/', '.html')):
+            continue
+        urls.append(resource_url)
+    return urls
+
+
+def mirror_site(site_url: str = SITE_URL, site_dir: Path = SITE_DIR, timeout: float = 30) -> MirrorResult:
+    """
+    下载页面及其引用的同源资源（包括脚本中引用的资源），保存为本地镜像
+
+    下载失败的文件跳过，不影响其他文件。
+
+    Returns:
+        保存和下载失败的URL
+    """
+    origin = urlparse(site_url)
+    pending = [f"{site_url}/{page}" for page in SITE_PAGES]
+    visited: Set[str] = set()
+    saved: List[str] = []
+    failed: List[str] = []
+
+    while pending:
+        url = pending.pop()
+        parsed = urlparse(url)
+        if url in visited or parsed.netloc != origin.netloc:
+            continue
+        visited.add(url)
+
+        try:
+            with urlopen(url, timeout=timeout) as response:
+                content = response.read()
+        except (OSError, ValueError):
+            # HTTP错误、超时、连接失败和无效的URL
+            failed.append(url)
+            continue
+        target = Path(site_dir) / parsed.path.lstrip('/')
+        target.parent.mkdir(parents=True, exist_ok=True)
+        target.write_bytes(content)
+        saved.append(url)
+
+        pending.extend(_references(url, target.suffix, content.decode('utf-8', errors='ignore')))
+
+    return MirrorResult(saved, failed)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="本地HOTEL PLANISPHERE站点")
+    parser.add_argument('--mirror', action='store_true', help="从公网站点下载镜像")
+    parser.add_argument('--port', type=int, default=8000, help="服务端口（默认8000）")
+    args = parser.parse_args()
+
+    if args.mirror:
+        result = mirror_site()
+        print(f"已保存 {len(result.saved)} 个文件到 {SITE_DIR}")
+        for url in result.failed:
+            print(f"下载失败: {url}")
+        if not LocalSiteServer().is_available():
+            raise SystemExit("页面不完整，本地站点不可用")
+    else:
+        server = LocalSiteServer(port=args.port)
+        print(f"本地站点: {server.start()}")
+        try:
+            threading.Event().wait()
+        except KeyboardInterrupt:
+            server.stop()
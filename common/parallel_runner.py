@@ -0,0 +1,134 @@
+import os
+import subprocess
+import sys
+from collections import OrderedDict
+from pathlib import Path
+from typing import Callable, List, Optional, Sequence, Union
+
+import pytest
+
+from common.driver_pool import WORKER_ID_ENV
+from common.durations import DurationStore
+
+# 工作进程读取的分片文件，文件中每行一个测试节点ID
+SHARD_FILE_ENV = 'TEST_SHARD_FILE'
+
+
+class _NodeIdCollector:
+    """收集测试节点ID的pytest插件"""
+
+    def __init__(self):
+        self.node_ids: List[str] = []
+
+    def pytest_collection_finish(self, session):
+        # 在所有collection_modifyitems钩子（包括排序插件）执行完后记录最终顺序
+        self.node_ids = [item.nodeid for item in session.items]
+
+
+class ParallelRunner:
+    """
+    多进程并行执行测试
+
+    先收集全部测试，按测试类分组（同一类中带order标记的测试必须在同一进程中按顺序执行），
+    再按历史耗时把分组分配到N个工作进程，每个进程用自己的浏览器执行一个pytest子进程。
+    """
+
+    def __init__(self, workers: int, test_path: Union[str, Sequence[str]] = "testcase/",
+                 pytest_args: Optional[List[str]] = None, shard_dir: str = "reports/shards"):
+        if workers < 1:
+            raise ValueError(f"工作进程数必须大于0: {workers}")
+        self.workers = workers
+        # 测试目录、文件或节点ID，可以传多个
+        self.test_paths = [test_path] if isinstance(test_path, str) else list(test_path)
+        self.pytest_args = pytest_args or []
+        self.shard_dir = Path(shard_dir)
+        self.durations = DurationStore()
+
+    def collect(self) -> List[str]:
+        """收集测试节点ID"""
+        collector = _NodeIdCollector()
+        result = pytest.main([*self.test_paths, "--collect-only", "-q", "-p", "no:cacheprovider"], plugins=[collector])
+        if result not in (pytest.ExitCode.OK, pytest.ExitCode.NO_TESTS_COLLECTED):
+            raise RuntimeError(f"测试收集失败，退出码: {result}")
+        return collector.node_ids
+
+    @staticmethod
+    def group_node_ids(node_ids: List[str]) -> List[List[str]]:
+        """按 文件::测试类 分组，保持收集时的顺序"""
+        groups: "OrderedDict[str, List[str]]" = OrderedDict()
+        for node_id in node_ids:
+            # 去掉参数化部分后取前两段，如 testcase/test_login.py::TestLogin
+            parts = node_id.split("[", 1)[0].split("::")
+            key = "::".join(parts[:2]) if len(parts) > 2 else parts[0]
+            groups.setdefault(key, []).append(node_id)
+        return list(groups.values())
+
+    @staticmethod
+    def shard(groups: List[List[str]], workers: int,
+              estimate: Optional[Callable[[str], float]] = None) -> List[List[str]]:
+        """
+        把分组分配到各工作进程（最长处理时间优先）
+
+        分组按估计总耗时从长到短，每次分给当前估计耗时最少的进程，
+        避免最后只剩一个进程在执行耗时长的测试。未指定estimate时每个测试按1计算。
+        """
+        estimate = estimate or (lambda node_id: 1.0)
+        costs = [(sum(estimate(node_id) for node_id in group), group) for group in groups]
+        shards: List[List[str]] = [[] for _ in range(workers)]
+        loads = [0.0] * workers
+        # 耗时相同时保持收集顺序（sorted是稳定排序）
+        for cost, group in sorted(costs, key=lambda item: item[0], reverse=True):
+            index = loads.index(min(loads))
+            shards[index].extend(group)
+            loads[index] += cost
+        return [shard for shard in shards if shard]
+
+    def run(self) -> int:
+        """并行执行测试，返回最大的退出码"""
+        node_ids = self.collect()
+        if not node_ids:
+            print("没有收集到测试用例")
+            return int(pytest.ExitCode.NO_TESTS_COLLECTED)
+
+        shards = self.shard(self.group_node_ids(node_ids), self.workers, self.durations.estimate)
+        print(f"共 {len(node_ids)} 个测试，分配到 {len(shards)} 个工作进程")
+        for index, shard in enumerate(shards):
+            seconds = sum(self.durations.estimate(node_id) for node_id in shard)
+            print(f"  gw{index}: {len(shard)} 个测试，预计 {seconds:.1f}s")
+
+        # 节点ID通过文件传递，避免命令行过长
+        self.shard_dir.mkdir(parents=True, exist_ok=True)
+        processes = []
+        for index, shard in enumerate(shards):
+            worker_id = f"gw{index}"
+            shard_file = self.shard_dir / f"{worker_id}.txt"
+            shard_file.write_text("\n".join(shard), encoding="utf-8")
+
+            env = dict(os.environ, **{WORKER_ID_ENV: worker_id, SHARD_FILE_ENV: str(shard_file)})
+            cmd = [sys.executable, "-m", "pytest", *self._worker_paths(), *self._worker_args(worker_id)]
+            processes.append(subprocess.Popen(cmd, env=env))
+
+        exit_code = max(process.wait() for process in processes)
+        # 合并各工作进程记录的耗时，供下次分配使用
+        self.durations.merge()
+        return exit_code
+
+    def _worker_paths(self) -> List[str]:
+        """工作进程的测试路径，只传文件部分，具体执行哪些测试由分片文件决定"""
+        return list(OrderedDict.fromkeys(path.split("::", 1)[0] for path in self.test_paths))
+
+    def _worker_args(self, worker_id: str) -> List[str]:
+        """为工作进程生成pytest参数，HTML报告按进程分别输出避免互相覆盖"""
+        args = []
+        for arg in self.pytest_args:
+            if arg.startswith("--html="):
+                html_path = Path(arg.split("=", 1)[1])
+                arg = f"--html={html_path.with_name(f'{html_path.stem}-{worker_id}{html_path.suffix}')}"
+            args.append(arg)
+        return args
+
+    @staticmethod
+    def load_shard(shard_file: str) -> List[str]:
+        """读取分片文件中的测试节点ID"""
+        content = Path(shard_file).read_text(encoding="utf-8")
+        return [line for line in content.splitlines() if line]
@@ -0,0 +1,108 @@
+"""
+预订金额计算
+
+与站点预订页面的计算规则相同：
+    住宿费 = 每晚每人房费 × 人数，周六、周日的晚上按1.25倍计算
+    早餐 = 每晚每人$10，提前入住 = 每人$10，观光 = 每人$10
+
+PriceCalendar为预订窗口（明天起90天）加上最长住宿天数预先计算每天的倍率和前缀和，
+任意 入住日期 + 住宿天数 的房费倍率之和只需一次相减，批量计算大量组合时不需要逐晚循环。
+"""
+from dataclasses import dataclass
+from datetime import date, timedelta
+from decimal import Decimal
+from functools import lru_cache
+from itertools import accumulate
+from typing import Dict, Iterable, List, Optional
+
+# 方案标题 -> 每晚每人房费（美元）
+PLAN_PRICES: Dict[str, Decimal] = {
+    "Plan with special offers": Decimal("70"),
+    "Premium plan": Decimal("100"),
+}
+
+WEEKEND_MULTIPLIER = Decimal("1.25")
+# 周六、周日
+WEEKEND_DAYS = (5, 6)
+
+BREAKFAST_PRICE = Decimal("10")
+EARLY_CHECK_IN_PRICE = Decimal("10")
+SIGHTSEEING_PRICE = Decimal("10")
+
+# 可以预订的最远日期（天）和最长住宿天数
+BOOKING_WINDOW_DAYS = 90
+MAX_TERM = 9
+
+
+@dataclass(frozen=True)
+class Reservation:
+    """计算金额所需的预订内容"""
+    plan_title: str
+    start: date
+    term: int
+    head_count: int
+    breakfast: bool = False
+    early_check_in: bool = False
+    sightseeing: bool = False
+
+
+def day_multiplier(day: date) -> Decimal:
+    """一晚的房费倍率"""
+    return WEEKEND_MULTIPLIER if day.weekday() in WEEKEND_DAYS else Decimal(1)
+
+
+def plan_price(plan_title: str) -> Decimal:
+    if plan_title not in PLAN_PRICES:
+        raise KeyError(f"没有方案的房费: {plan_title}")
+    return PLAN_PRICES[plan_title]
+
+
+class PriceCalendar:
+    """预先计算的 日期 -> 房费倍率 表"""
+
+    def __init__(self, today: Optional[date] = None, window_days: int = BOOKING_WINDOW_DAYS,
+                 max_term: int = MAX_TERM):
+        self.today = today or date.today()
+        self.days = window_days + max_term + 1
+        self.multipliers = tuple(day_multiplier(self.today + timedelta(days=i)) for i in range(self.days))
+        # cumulative[i] 为前i天的倍率之和
+        self.cumulative = (Decimal(0), *accumulate(self.multipliers))
+
+    @classmethod
+    @lru_cache(maxsize=None)
+    def for_date(cls, today: date) -> "PriceCalendar":
+        """同一天共用一个表"""
+        return cls(today)
+
+    @classmethod
+    def current(cls) -> "PriceCalendar":
+        return cls.for_date(date.today())
+
+    def nights(self, start: date, term: int) -> Decimal:
+        """入住term晚的房费倍率之和"""
+        offset = (start - self.today).days
+        if 0 <= offset and offset + term <= self.days:
+            return self.cumulative[offset + term] - self.cumulative[offset]
+        # 超出表的范围时逐晚计算
+        return sum((day_multiplier(start + timedelta(days=i)) for i in range(term)), Decimal(0))
+
+    def total(self, reservation: Reservation) -> Decimal:
+        """预订的总金额"""
+        head_count, term = reservation.head_count, reservation.term
+        total = plan_price(reservation.plan_title) * self.nights(reservation.start, term) * head_count
+        if reservation.breakfast:
+            total += BREAKFAST_PRICE * head_count * term
+        if reservation.early_check_in:
+            total += EARLY_CHECK_IN_PRICE * head_count
+        if reservation.sightseeing:
+            total += SIGHTSEEING_PRICE * head_count
+        return total
+
+    def totals(self, reservations: Iterable[Reservation]) -> List[Decimal]:
+        """批量计算总金额"""
+        return [self.total(reservation) for reservation in reservations]
+
+
+def format_total_bill(amount: Decimal) -> str:
+    """格式化为确认页面显示的金额，如 Total $1,120.00 (included taxes)"""
+    return f"Total ${amount:,.2f} (included taxes)"
@@ -0,0 +1,112 @@
+"""
+页面重定向检查
+
+站点的重定向由页面JS根据登录状态执行，检查时不需要在主窗口中逐个完整加载页面：
+在已加载的站点页面中为每个目标创建一个隐藏的iframe，一次异步脚本调用等待所有iframe
+重定向完成并返回最终URL。同源的iframe共享cookies和storage，登录状态与当前页面相同；
+sandbox属性禁止iframe中的脚本跳转顶层页面。
+
+无法在iframe中读取URL的目标（如禁止嵌入的页面）改为用TabRunner在标签页中检查。
+"""
+from typing import Dict, Optional, Sequence
+from urllib.parse import urlparse
+
+from selenium import webdriver
+from selenium.common.exceptions import TimeoutException
+from selenium.webdriver.support import expected_conditions as EC
+
+from common.tab_runner import TabRunner
+from common.utils import Utils
+
+# 参数: 目标URL列表, 期望URL包含的字符串, 超时毫秒数；返回 URL -> 最终URL（无法读取时为null）
+_CHECK_REDIRECTS_SCRIPT = """
+var urls = arguments[0], expected = arguments[1], timeoutMs = arguments[2];
+var callback = arguments[arguments.length - 1];
+var results = {}, frames = [], remaining = urls.length, done = false;
+var container = document.createElement('div');
+container.style.cssText = 'position:absolute;width:0;height:0;overflow:hidden;visibility:hidden;';
+document.body.appendChild(container);
+
+var currentUrl = function(frame) {
+    try { return frame.contentWindow.location.href; } catch (e) { return null; }
+};
+var finish = function() {
+    if (done) { return; }
+    done = true;
+    clearTimeout(timer);
+    urls.forEach(function(url, i) {
+        if (!(url in results)) { results[url] = currentUrl(frames[i]); }
+    });
+    container.remove();
+    callback(results);
+};
+var timer = setTimeout(finish, timeoutMs);
+
+urls.forEach(function(url) {
+    var frame = document.createElement('iframe');
+    frame.setAttribute('sandbox', 'allow-scripts allow-same-origin allow-forms');
+    frame.addEventListener('load', function() {
+        var href = currentUrl(frame);
+        if (href !== null && href.indexOf(expected) >= 0 && !(url in results)) {
+            results[url] = href;
+            if (--remaining === 0) { finish(); }
+        }
+    });
+    frame.src = url;
+    frames.push(frame);
+    container.appendChild(frame);
+});
+if (remaining === 0) { finish(); }
+"""
+
+
+class RedirectChecker:
+    """在当前页面中批量检查页面重定向"""
+
+    def __init__(self, driver: webdriver.Chrome, timeout: float = 10):
+        self.driver = driver
+        self.timeout = timeout
+
+    def check(self, paths: Sequence[str], expected: str = "index.html") -> Dict[str, Optional[str]]:
+        """
+        同时打开所有页面，等待它们重定向到URL包含expected的页面
+
+        Args:
+            paths: 相对于BASE_URL的页面路径，如 /mypage.html
+            expected: 重定向目标URL包含的字符串
+
+        Returns:
+            路径 -> 最终URL；超时未重定向时为当时的URL，无法检查时为None
+        """
+        # iframe需要与目标页面同源才能读取其URL和共享登录状态
+        parsed = urlparse(Utils.BASE_URL)
+        origin = f"{parsed.scheme}://{parsed.netloc}"
+        if not self.driver.current_url.startswith(origin):
+            self.driver.get(Utils.BASE_URL)
+
+        urls = {path: Utils.BASE_URL + path for path in paths}
+        final_urls = self.driver.execute_async_script(
+            _CHECK_REDIRECTS_SCRIPT, list(urls.values()), expected, int(self.timeout * 1000)
+        )
+        results = {path: final_urls.get(url) for path, url in urls.items()}
+
+        unchecked = [path for path, url in results.items() if url is None]
+        if unchecked:
+            results.update(self._check_in_tabs(unchecked, expected))
+        return results
+
+    def _check_in_tabs(self, paths: Sequence[str], expected: str) -> Dict[str, Optional[str]]:
+        """在标签页中完整加载页面检查重定向"""
+        def open_page(path):
+            def flow(tab):
+                tab.navigate(Utils.BASE_URL + path)
+                try:
+                    yield EC.url_contains(expected)
+                except TimeoutException:
+                    # 未重定向时返回当时的URL，由调用方断言
+                    pass
+                return tab.driver.current_url
+            return flow
+
+        results = TabRunner(self.driver, timeout=self.timeout).run([open_page(path) for path in paths])
+        return {path: result.get() for path, result in zip(paths, results)}
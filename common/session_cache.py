@@ -0,0 +1,106 @@
+from typing import Any, Dict
+from urllib.parse import urlparse
+
+from selenium import webdriver
+
+from common.utils import Utils
+
+# 导出当前页面的localStorage和sessionStorage
+_DUMP_STORAGE_SCRIPT = """
+var dump = function(storage) {
+    var data = {};
+    for (var i = 0; i < storage.length; i++) {
+        var key = storage.key(i);
+        data[key] = storage.getItem(key);
+    }
+    return data;
+};
+return {local: dump(window.localStorage), session: dump(window.sessionStorage)};
+"""
+
+# 把快照写回localStorage和sessionStorage
+_RESTORE_STORAGE_SCRIPT = """
+var snapshot = arguments[0];
+Object.keys(snapshot.local).forEach(function(key) {
+    window.localStorage.setItem(key, snapshot.local[key]);
+});
+Object.keys(snapshot.session).forEach(function(key) {
+    window.sessionStorage.setItem(key, snapshot.session[key]);
+});
+"""
+
+
+class SessionCache:
+    """
+    登录会话缓存
+
+    每个用户第一次登录时走完整的UI流程（首页 -> 登录页 -> 个人页面），
+    然后保存cookies和localStorage/sessionStorage快照；之后同一用户再登录时
+    直接把快照注入浏览器，跳过登录页面的加载和表单提交。
+    """
+
+    def __init__(self, driver: webdriver.Chrome):
+        self.driver = driver
+        self._snapshots: Dict[str, Dict[str, Any]] = {}
+
+    def login(self, email: str, password: str):
+        """以指定用户登录并返回个人页面"""
+        from pages.my_page import MyPage
+
+        if self._has_snapshot(email, password):
+            self._restore(self._snapshots[email])
+            return MyPage.open(self.driver)
+        return self._login_via_ui(email, password)
+
+    def inject_login(self, email: str, password: str) -> None:
+        """以指定用户登录，但不跳转到个人页面"""
+        if self._has_snapshot(email, password):
+            self._restore(self._snapshots[email])
+        else:
+            self._login_via_ui(email, password)
+
+    def invalidate(self, email: str) -> None:
+        """删除指定用户的会话快照，如用户被删除或信息被修改后"""
+        self._snapshots.pop(email, None)
+
+    def clear(self) -> None:
+        """删除所有会话快照"""
+        self._snapshots.clear()
+
+    def _has_snapshot(self, email: str, password: str) -> bool:
+        snapshot = self._snapshots.get(email)
+        return snapshot is not None and snapshot['password'] == password
+
+    def _login_via_ui(self, email: str, password: str):
+        """通过UI登录并保存会话快照"""
+        # 在此处导入以避免循环导入
+        from pages.top_page import TopPage
+
+        self.driver.get(Utils.BASE_URL)
+        top_page = TopPage(self.driver)
+        login_page = top_page.go_to_login_page()
+        my_page = login_page.do_login(email, password)
+
+        storage = self.driver.execute_script(_DUMP_STORAGE_SCRIPT)
+        self._snapshots[email] = {
+            'password': password,
+            'cookies': self.driver.get_cookies(),
+            'local': storage['local'],
+            'session': storage['session'],
+        }
+        return my_page
+
+    def _restore(self, snapshot: Dict[str, Any]) -> None:
+        """把会话快照注入浏览器"""
+        # cookies和storage只能写入当前页面所在的源
+        parsed = urlparse(Utils.BASE_URL)
+        origin = f"{parsed.scheme}://{parsed.netloc}"
+        if not self.driver.current_url.startswith(origin):
+            self.driver.get(Utils.BASE_URL)
+
+        for cookie in snapshot['cookies']:
+            self.driver.add_cookie(cookie)
+        self.driver.execute_script(_RESTORE_STORAGE_SCRIPT, {
+            'local': snapshot['local'],
+            'session': snapshot['session'],
+        })
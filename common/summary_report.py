@@ -0,0 +1,161 @@
+"""
+进程内汇总报告
+
+在测试运行期间跟踪Allure结果目录，每个测试的 *-result.json 写出后立即读取，
+运行结束时直接输出自包含的HTML汇总报告（内联样式，无外部资源），
+不需要启动Allure CLI（JVM），也不需要重新处理历史结果。
+
+也可以为已有的结果目录单独生成：
+    python -m common.summary_report reports/allure-runs/<运行ID> -o reports/summary.html
+"""
+import argparse
+import html
+import json
+import os
+import threading
+from collections import Counter
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Optional, Set
+
+STATUSES = ('passed', 'failed', 'broken', 'skipped', 'unknown')
+
+_STYLE = """
+body { font-family: -apple-system, "Segoe UI", "Microsoft YaHei", sans-serif; margin: 24px; color: #222; }
+h1 { font-size: 20px; }
+.counts span { display: inline-block; margin-right: 16px; padding: 4px 10px; border-radius: 4px; color: #fff; }
+.passed { background: #2e7d32; } .failed { background: #c62828; } .broken { background: #ef6c00; }
+.skipped { background: #757575; } .unknown { background: #6a1b9a; }
+table { border-collapse: collapse; width: 100%; margin-top: 16px; font-size: 13px; }
+th, td { border: 1px solid #ddd; padding: 6px 8px; text-align: left; vertical-align: top; }
+th { background: #f5f5f5; }
+td.status { color: #fff; font-weight: bold; }
+pre { white-space: pre-wrap; margin: 0; font-size: 12px; }
+"""
+
+
+class SummaryReport:
+    """按结果文件增量汇总的测试报告"""
+
+    def __init__(self, results_dir: Path):
+        self.results_dir = Path(results_dir)
+        # historyId -> 测试结果，同一测试重跑时保留最后一次
+        self.results: Dict[str, Dict[str, Any]] = {}
+        self._seen: Set[str] = set()
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def consume(self, path: Path) -> None:
+        """读取一个Allure结果文件"""
+        try:
+            data = json.loads(Path(path).read_text(encoding='utf-8'))
+        except (OSError, ValueError):
+            # 文件可能还在写入，下次扫描再读
+            return
+        self._seen.add(Path(path).name)
+
+        labels = {label['name']: label['value'] for label in data.get('labels', [])}
+        details = data.get('statusDetails') or {}
+        start, stop = data.get('start') or 0, data.get('stop') or 0
+        row = {
+            'name': data.get('name', ''),
+            'full_name': data.get('fullName', ''),
+            'parameters': ", ".join(
+                f"{param['name']}={param['value']}" for param in data.get('parameters', [])
+            ),
+            'feature': labels.get('feature', ''),
+            'story': labels.get('story', ''),
+            'status': data.get('status', 'unknown'),
+            'start': start,
+            'duration': max(stop - start, 0) / 1000,
+            'message': details.get('message', ''),
+            'trace': details.get('trace', ''),
+        }
+        with self._lock:
+            key = data.get('historyId') or data.get('uuid') or Path(path).name
+            previous = self.results.get(key)
+            if previous is None or previous['start'] <= row['start']:
+                self.results[key] = row
+
+    def scan(self) -> int:
+        """读取结果目录中新出现的结果文件，返回本次读取的文件数"""
+        if not self.results_dir.is_dir():
+            return 0
+        count = 0
+        with os.scandir(self.results_dir) as entries:
+            for entry in entries:
+                if entry.name.endswith('-result.json') and entry.name not in self._seen:
+                    self.consume(Path(entry.path))
+                    count += 1
+        return count
+
+    def follow(self, interval: float = 0.5) -> None:
+        """在后台线程中持续读取测试运行期间写出的结果"""
+        def loop():
+            while not self._stop.wait(interval):
+                self.scan()
+
+        self._stop.clear()
+        self._thread = threading.Thread(target=loop, daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """停止跟踪并读取剩余的结果"""
+        self._stop.set()
+        if self._thread:
+            self._thread.join()
+            self._thread = None
+        self.scan()
+
+    def counts(self) -> Counter:
+        with self._lock:
+            return Counter(row['status'] for row in self.results.values())
+
+    def render(self, title: str = "测试汇总报告") -> str:
+        """生成自包含的HTML"""
+        with self._lock:
+            rows = sorted(self.results.values(), key=lambda row: (row['feature'], row['full_name'], row['start']))
+        counts = self.counts()
+        total_duration = sum(row['duration'] for row in rows)
+
+        parts = [
+            "<!DOCTYPE html><html><head><meta charset='utf-8'>",
+            f"<title>{html.escape(title)}</title><style>{_STYLE}</style></head><body>",
+            f"<h1>{html.escape(title)}</h1>",
+            f"<p>生成时间: {datetime.now():%Y-%m-%d %H:%M:%S} ｜ 测试数: {len(rows)} ｜ 总耗时: {total_duration:.1f}s</p>",
+            "<div class='counts'>",
+            *(f"<span class='{status}'>{status}: {counts[status]}</span>" for status in STATUSES if counts[status]),
+            "</div>",
+            "<table><tr><th>状态</th><th>功能</th><th>场景</th><th>测试</th><th>参数</th><th>耗时</th><th>信息</th></tr>",
+        ]
+        for row in rows:
+            message = row['message'] or ''
+            if row['trace']:
+                message = f"{message}\n{row['trace']}"
+            parts.append(
+                f"<tr><td class='status {html.escape(row['status'])}'>{html.escape(row['status'])}</td>"
+                f"<td>{html.escape(row['feature'])}</td><td>{html.escape(row['story'])}</td>"
+                f"<td>{html.escape(row['name'])}<br><small>{html.escape(row['full_name'])}</small></td>"
+                f"<td><small>{html.escape(row['parameters'])}</small></td>"
+                f"<td>{row['duration']:.2f}s</td><td><pre>{html.escape(message)}</pre></td></tr>"
+            )
+        parts.append("</table></body></html>")
+        return "".join(parts)
+
+    def write(self, output: Path, title: str = "测试汇总报告") -> Path:
+        output = Path(output)
+        output.parent.mkdir(parents=True, exist_ok=True)
+        output.write_text(self.render(title), encoding='utf-8')
+        return output
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="从Allure结果目录生成HTML汇总报告")
+    parser.add_argument('results_dir', help="Allure结果目录")
+    parser.add_argument('-o', '--output', default='reports/summary.html', help="输出文件（默认reports/summary.html）")
+    args = parser.parse_args()
+
+    report = SummaryReport(Path(args.results_dir))
+    report.scan()
+    print(f"汇总报告: {report.write(Path(args.output))}")
@@ -0,0 +1,194 @@
+"""
+多标签页并发执行
+
+WebDriver会话一次只执行一个命令，但浏览器中不同标签页的页面加载可以同时进行。
+TabRunner为每个流程打开一个标签页，流程是生成器函数：导航以非阻塞方式发起，
+需要等待时yield一个等待条件（与expected_conditions相同，接收driver的可调用对象），
+调度器轮流切换到各标签页检查条件，条件成立后把结果send回生成器继续执行。
+这样多个以等待网络为主的流程在同一个浏览器中重叠执行。
+
+流程恢复执行和检查条件之前，调度器总是先切换到该流程的标签页，
+流程中创建的页面对象因此始终操作自己的标签页。标签页共享cookies和localStorage，
+只适合登录状态相同、互不修改数据的流程。新标签页沿用浏览器的资源屏蔽设置。
+
+TabRunner是测试内部的工具，不是测试级的执行模式：pytest仍然在一个浏览器中逐个执行测试，
+不会把不同测试调度到不同标签页。目前只有RedirectChecker在iframe无法读取URL时用它
+在标签页中检查重定向；同源站点上不会走到这一步，因此现有测试没有因此而并发。
+test_plans的各个测试使用不同的登录身份，标签页共享cookies，也不能放在同一个浏览器中并发。
+
+    def open_mypage(tab):
+        tab.navigate(Utils.BASE_URL + "/mypage.html")
+        yield EC.url_contains("index.html")
+        return tab.driver.current_url
+
+    results = TabRunner(driver).run([open_mypage])
+    url = results[0].get()
+"""
+import inspect
+import time
+from collections import deque
+from typing import Any, Callable, Deque, Generator, List, NamedTuple, Optional, Tuple
+
+from selenium import webdriver
+from selenium.common.exceptions import (
+    NoSuchElementException,
+    StaleElementReferenceException,
+    TimeoutException,
+    WebDriverException,
+)
+
+from common.driver_pool import apply_resource_blocking
+
+# 检查条件时忽略的异常，与WebDriverWait的默认行为一致
+_IGNORED_EXCEPTIONS = (NoSuchElementException, StaleElementReferenceException)
+
+Condition = Callable[[webdriver.Chrome], Any]
+Flow = Callable[['Tab'], Any]
+
+
+class Tab:
+    """流程使用的标签页"""
+
+    def __init__(self, driver: webdriver.Chrome, handle: str):
+        self.driver = driver
+        self.handle = handle
+
+    def navigate(self, url: str) -> None:
+        """发起导航后立即返回，不等待页面加载完成"""
+        self.driver.execute_script("window.location.href = arguments[0];", url)
+
+
+class TabResult(NamedTuple):
+    """一个流程的执行结果"""
+    value: Any
+    error: Optional[BaseException]
+
+    def get(self) -> Any:
+        """返回流程的返回值，流程失败时抛出其异常"""
+        if self.error is not None:
+            raise self.error
+        return self.value
+
+
+class _Task:
+    def __init__(self, index: int, tab: Tab, steps: Generator):
+        self.index = index
+        self.tab = tab
+        self.steps = steps
+        self.condition: Optional[Condition] = None
+        self.deadline = 0.0
+
+
+class TabRunner:
+    """在同一个浏览器的多个标签页中并发执行流程"""
+
+    def __init__(self, driver: webdriver.Chrome, max_tabs: int = 4, timeout: float = 10,
+                 poll_frequency: float = 0.1):
+        if max_tabs < 1:
+            raise ValueError(f"标签页数必须大于0: {max_tabs}")
+        self.driver = driver
+        self.max_tabs = max_tabs
+        self.timeout = timeout
+        self.poll_frequency = poll_frequency
+
+    def run(self, flows: List[Flow]) -> List[TabResult]:
+        """
+        执行所有流程，按传入顺序返回结果
+
+        同时打开的标签页不超过max_tabs个，流程结束后立即关闭其标签页，
+        全部结束后切换回原来的窗口。单个流程失败或超时不影响其他流程。
+        """
+        original_handle = self.driver.current_window_handle
+        pending: Deque = deque(enumerate(flows))
+        active: List[_Task] = []
+        results: List[Optional[TabResult]] = [None] * len(flows)
+        try:
+            while pending or active:
+                while pending and len(active) < self.max_tabs:
+                    index, flow = pending.popleft()
+                    task = self._start(index, flow, results)
+                    if task is not None:
+                        active.append(task)
+
+                progressed = False
+                for task in list(active):
+                    try:
+                        self.driver.switch_to.window(task.tab.handle)
+                        value, error = self._check(task)
+                        if error is None and not value:
+                            if time.monotonic() < task.deadline:
+                                continue
+                            error = TimeoutException(f"等待条件超时({self.timeout}s): {task.condition!r}")
+                        finished = self._advance(task, results, value=value, error=error)
+                    except Exception as e:
+                        # 切换标签页失败等错误只结束该流程
+                        task.steps.close()
+                        results[task.index] = TabResult(None, e)
+                        finished = True
+                    progressed = True
+                    if finished:
+                        active.remove(task)
+                        self._close(task.tab)
+
+                if active and not progressed:
+                    time.sleep(self.poll_frequency)
+        finally:
+            for task in active:
+                task.steps.close()
+                self._close(task.tab)
+            self.driver.switch_to.window(original_handle)
+        return results
+
+    def _start(self, index: int, flow: Flow, results: List[Optional[TabResult]]) -> Optional[_Task]:
+        """打开标签页并执行流程到第一个等待条件，流程已结束时返回None"""
+        self.driver.switch_to.new_window('tab')
+        apply_resource_blocking(self.driver)
+        tab = Tab(self.driver, self.driver.current_window_handle)
+        try:
+            steps = flow(tab)
+        except Exception as e:
+            results[index] = TabResult(None, e)
+            self._close(tab)
+            return None
+        if not inspect.isgenerator(steps):
+            # 不需要等待的普通函数
+            results[index] = TabResult(steps, None)
+            self._close(tab)
+            return None
+
+        task = _Task(index, tab, steps)
+        if self._advance(task, results):
+            self._close(tab)
+            return None
+        return task
+
+    def _check(self, task: _Task) -> Tuple[Any, Optional[BaseException]]:
+        """检查流程等待的条件，返回 (条件的值, 异常)；条件不可调用时的异常同样交给流程处理"""
+        try:
+            return task.condition(self.driver), None
+        except _IGNORED_EXCEPTIONS:
+            return None, None
+        except Exception as e:
+            return None, e
+
+    def _advance(self, task: _Task, results: List[Optional[TabResult]], value: Any = None,
+                 error: Optional[BaseException] = None) -> bool:
+        """把条件结果（或异常）交给流程继续执行，返回流程是否已结束"""
+        try:
+            condition = task.steps.throw(error) if error is not None else task.steps.send(value)
+        except StopIteration as stop:
+            results[task.index] = TabResult(stop.value, None)
+            return True
+        except Exception as e:
+            results[task.index] = TabResult(None, e)
+            return True
+        task.condition = condition
+        task.deadline = time.monotonic() + self.timeout
+        return False
+
+    def _close(self, tab: Tab) -> None:
+        try:
+            self.driver.switch_to.window(tab.handle)
+            self.driver.close()
+        except WebDriverException:
+            pass
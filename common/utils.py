@@ -1,8 +1,8 @@
 import os
 import yaml
-from typing import List, Set, Dict, Any
+from typing import Set, Dict, Any, Sequence
 from pathlib import Path
-from datetime import datetime, timedelta
+from common.case_store import case_store
 
 # 工具类，存放与页面无关的复用逻辑
 class Utils:
@@ -27,7 +27,7 @@ class Utils:
             return yaml.safe_load(file)
     
     @staticmethod
-    def get_test_cases(yaml_file: str, case_key: str) -> List[Dict[str, Any]]:
+    def get_test_cases(yaml_file: str, case_key: str) -> Sequence[Any]:
         """
         通用的测试用例获取方法
         
@@ -36,36 +36,23 @@ class Utils:
             case_key: 测试用例在YAML中的键名，如：'login_success_cases'
             
         Returns:
-            测试用例列表
+            测试用例列表（不可修改的用例模型，见common.case_models），同一文件在一次运行中只解析一次
             
         Examples:
             # 获取登录成功用例
             Utils.get_test_cases('../data/login_cases.yaml', 'login_success_cases')
         """
-        data = Utils.load_yaml_data(yaml_file)
-        return data.get(case_key, [])
+        full_path = os.path.join(os.path.dirname(__file__), yaml_file)
+        return case_store.get_cases(full_path, case_key)
     
     @staticmethod
     def clean_old_allure_results(days_to_keep: int = 3, reports_dir: str = "reports"):
-        """清理指定天数之前的allure-results文件"""
-        allure_results_dir = Path(reports_dir) / "allure-results"
-        
-        if not allure_results_dir.exists():
-            return
-        
-        cutoff_time = datetime.now() - timedelta(days=days_to_keep)
-        cleaned_count = 0
-        
-        # 清理旧的JSON文件
-        for file_path in allure_results_dir.glob("*.json"):
-            try:
-                file_time = datetime.fromtimestamp(file_path.stat().st_mtime)
-                if file_time < cutoff_time:
-                    file_path.unlink()
-                    cleaned_count += 1
-            except Exception:
-                # 忽略无法删除的文件
-                continue
-        
-        if cleaned_count > 0:
-            print(f"已清理 {cleaned_count} 个 {days_to_keep} 天前的allure结果文件") 
\ No newline at end of file
+        """清理指定天数之前的allure运行结果（按运行整目录删除），旧版本的allure-results目录先迁移为一次运行"""
+        # 在此处导入以避免工具类依赖报告模块
+        from common.allure_store import AllureStore
+
+        store = AllureStore(Path(reports_dir) / "allure-runs")
+        store.migrate_legacy(Path(reports_dir) / "allure-results")
+        removed = store.prune(days_to_keep=days_to_keep)
+        if removed > 0:
+            print(f"已清理 {removed} 次 {days_to_keep} 天前的allure运行结果")
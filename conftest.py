@@ -1,49 +1,183 @@
 import pytest
-from selenium import webdriver
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.chrome.options import Options
+import allure
 import os
+from collections.abc import Mapping
+from common.utils import Utils
+from common.case_store import case_store, DATA_DIR
+from common.case_index import normalize_case_id
+from common.driver_pool import DriverPool, set_resource_blocking, get_worker_id
+from common.command_timing import CommandTimer
+from common.session_cache import SessionCache
+from common.local_server import LocalSiteServer
+from common.parallel_runner import ParallelRunner, SHARD_FILE_ENV
+from common.durations import DurationStore
 
-# setup和teardown
-@pytest.fixture(scope="class")
-def driver():
-    """测试类的WebDriver fixture"""
-    service = Service(r'C:\Users\seeki\AppData\Local\Programs\Python\Python312\chromedriver.exe')
-    
-    # 设置Chrome选项
-    chrome_options = Options()
-    chrome_options.add_argument('--window-size=1920,1080')
-    chrome_options.add_experimental_option('prefs', {
-        'credentials_enable_service': False,
-        'profile.password_manager_enabled': False,
-        'profile.password_manager_leak_detection': False
-    })
-    
-    # 检查无头模式的环境变量
-    github_actions = os.getenv('GITHUB_ACTIONS', 'false').lower() == 'true'
-    remote_containers = os.getenv('REMOTE_CONTAINERS', 'false').lower() == 'true'
-    codespaces = os.getenv('CODESPACES', 'false').lower() == 'true'
-    
-    if github_actions:
-        chrome_options.add_argument('--headless')
-    elif remote_containers or codespaces:
-        chrome_options.add_argument('--headless')
-        chrome_options.add_argument('--no-sandbox')
+# 当前进程（串行运行时为主进程，并行运行时为工作进程）的浏览器池
+_driver_pool = DriverPool()
+# WebDriver命令耗时统计，--command-timing或COMMAND_TIMING=true时启用
+_command_timer = CommandTimer()
+# 本进程中每个测试的耗时（setup + call + teardown），会话结束时写入耗时数据库
+_test_durations = {}
+
+
+def pytest_addoption(parser):
+    parser.addoption(
+        "--command-timing", action="store_true",
+        default=os.getenv('COMMAND_TIMING', 'false').lower() == 'true',
+        help="记录每个WebDriver命令的耗时，输出单个测试的耗时分解和全局热点表"
+    )
+    parser.addoption(
+        "--case-id", action="append", default=[],
+        help="只运行（和加载）指定id的数据驱动用例，可重复或用逗号分隔，如 --case-id blank_values,valid_login"
+    )
+
+
+def _selected_case_ids(config):
+    """--case-id指定的用例id，未指定时返回None"""
+    case_ids = {case_id.strip() for value in config.getoption("case_id") for case_id in value.split(',')}
+    case_ids.discard('')
+    return case_ids or None
+
+
+@pytest.fixture(scope="session")
+def local_site():
+    """
+    按需启动本地站点并把Utils.BASE_URL指向它
     
-    driver = webdriver.Chrome(service=service, options=chrome_options)
+    USE_LOCAL_SITE=true 必须使用本地站点；false 始终使用BASE_URL；
+    默认auto：未设置BASE_URL环境变量且本地镜像存在时使用本地站点
+    """
+    mode = os.getenv('USE_LOCAL_SITE', 'auto').lower()
+    server = LocalSiteServer()
+    use_local = mode == 'true' or (mode == 'auto' and not os.getenv('BASE_URL') and server.is_available())
+    if not use_local:
+        yield None
+        return
+
+    original_base_url = Utils.BASE_URL
+    Utils.BASE_URL = server.start()
+    yield server
+    Utils.BASE_URL = original_base_url
+    server.stop()
+
+
+# setup和teardown
+@pytest.fixture(scope="session")
+def driver(request, local_site):
+    """会话级WebDriver fixture，整个运行（并行时为每个工作进程）只启动一个浏览器"""
+    driver = _driver_pool.acquire()
+    if request.config.getoption("command_timing"):
+        _command_timer.record_startup(_driver_pool.startup_seconds.get(driver, 0.0))
+        _command_timer.install(driver)
     yield driver
-    driver.quit()
+    _driver_pool.release(driver)
+
+
+@pytest.fixture(scope="session")
+def session_cache(driver):
+    """登录会话缓存，同一用户在整个运行中只通过UI登录一次"""
+    return SessionCache(driver)
+
+
+@pytest.fixture(scope="class", autouse=True)
+def fresh_browser(driver):
+    """每个测试类开始前完全重置浏览器状态，等同于启动一个新浏览器"""
+    _driver_pool.reset(driver, Utils.BASE_URL, full=True)
 
 
 @pytest.fixture(autouse=True)
-def clear_cookies(driver):
-    """每个测试后清除cookies"""
+def allow_resources(request, driver):
+    """标记了load_resources的测试在屏蔽资源的配置下临时取消屏蔽"""
+    if not (_driver_pool.block_resources and request.node.get_closest_marker("load_resources")):
+        yield
+        return
+    set_resource_blocking(driver, False)
     yield
-    driver.delete_all_cookies()
+    set_resource_blocking(driver, True)
+
+
+@pytest.fixture(autouse=True)
+def command_timing_report(request):
+    """把当前测试的WebDriver命令耗时分解附加到allure报告"""
+    yield
+    if request.config.getoption("command_timing"):
+        allure.attach(
+            _command_timer.format_breakdown(request.node.nodeid),
+            name="WebDriver命令耗时",
+            attachment_type=allure.attachment_type.TEXT
+        )
+
+
+@pytest.fixture(autouse=True)
+def reset_browser_state(driver):
+    """每个测试后关闭弹窗和多余窗口，并清除cookies"""
+    yield
+    _driver_pool.reset(driver, Utils.BASE_URL)
 
 
 def pytest_configure(config):
-    """配置pytest"""
+    """配置pytest，并在收集测试前并行加载所有用例文件"""
+    case_store.select(_selected_case_ids(config))
+    case_store.preload(sorted(str(path) for path in DATA_DIR.glob('*.yaml')))
     config.addinivalue_line(
         "markers", "order: 标记测试以特定顺序运行"
-    ) 
\ No newline at end of file
+    )
+    config.addinivalue_line(
+        "markers", "load_resources: 标记测试需要加载图片、字体等资源，不受PERF_PROFILE资源屏蔽影响"
+    )
+
+
+def pytest_collection_modifyitems(config, items):
+    """按--case-id筛选数据驱动用例；并行模式下只保留分配给当前工作进程的测试"""
+    case_ids = _selected_case_ids(config)
+    if case_ids:
+        def is_selected(item):
+            test_case = item.callspec.params.get('test_case') if hasattr(item, 'callspec') else None
+            # 所有用例都被筛掉的参数化测试会得到NOTSET参数
+            case_id = test_case.get('id') if isinstance(test_case, Mapping) else getattr(test_case, 'id', None)
+            return normalize_case_id(case_id) in case_ids
+        deselected = [item for item in items if not is_selected(item)]
+        if deselected:
+            config.hook.pytest_deselected(items=deselected)
+            items[:] = [item for item in items if is_selected(item)]
+
+    shard_file = os.getenv(SHARD_FILE_ENV)
+    if not shard_file:
+        return
+
+    selected_ids = set(ParallelRunner.load_shard(shard_file))
+    selected = [item for item in items if item.nodeid in selected_ids]
+    deselected = [item for item in items if item.nodeid not in selected_ids]
+    if deselected:
+        config.hook.pytest_deselected(items=deselected)
+        items[:] = selected
+
+
+def pytest_runtest_logstart(nodeid, location):
+    """把之后的WebDriver命令归属到当前测试"""
+    _command_timer.current_test = nodeid
+
+
+def pytest_runtest_logfinish(nodeid, location):
+    _command_timer.current_test = None
+
+
+def pytest_runtest_logreport(report):
+    """累计每个测试各阶段的耗时"""
+    _test_durations[report.nodeid] = _test_durations.get(report.nodeid, 0.0) + report.duration
+
+
+def pytest_terminal_summary(terminalreporter, exitstatus, config):
+    """输出WebDriver命令耗时热点表"""
+    if config.getoption("command_timing") and _command_timer.records:
+        terminalreporter.write_sep("=", "WebDriver命令耗时热点")
+        terminalreporter.write_line(_command_timer.format_hotspots())
+
+
+def pytest_sessionfinish(session, exitstatus):
+    """会话结束时输出命令耗时统计并记录测试耗时，然后退出浏览器池中的所有浏览器"""
+    if session.config.getoption("command_timing") and _command_timer.records:
+        _command_timer.write_json(f"reports/command-timings-{get_worker_id()}.json")
+    if _test_durations and not session.config.getoption("collectonly"):
+        DurationStore().record(get_worker_id(), _test_durations)
+    _driver_pool.close()
@@ -0,0 +1,266 @@
+"""
+基于CDP的异步页面对象基类
+
+BasePage的每个操作都是一次阻塞的WebDriver HTTP命令，AsyncBasePage则通过
+WebSocket直接连接到当前标签页的Chrome DevTools协议（CDP），命令按id匹配响应，
+相互独立的命令可以同时发出（asyncio.gather），不必等前一个命令返回。
+批量读取和填写字段与BasePage一样在一次脚本调用中完成，页面脚本也与BasePage共用。
+
+需要可选依赖websockets（pip install websockets），只支持Chrome：
+
+    my_page = MyPage(driver)
+    async with await AsyncMyPage.attach(driver) as async_page:
+        info = await async_page.snapshot()
+"""
+import asyncio
+import itertools
+import json
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.request import urlopen
+
+from selenium import webdriver
+from selenium.common.exceptions import JavascriptException, TimeoutException
+from selenium.webdriver.common.by import By
+
+from pages.base_page import (
+    BasePage, FIND_ELEMENT_JS, READ_FIELDS_JS, SET_FIELDS_SCRIPT, ElementNotFoundError, IllegalStateError
+)
+
+try:
+    import websockets
+except ImportError:
+    websockets = None
+
+# 把脚本包装为函数调用，脚本写法与driver.execute_script相同（用return返回值，参数为arguments）
+_CALL_SCRIPT = "(function() {\n%s\n%s\n}).apply(null, %s)"
+
+# 在页面内轮询条件，条件成立时兑现Promise，超时返回null
+_WAIT_SCRIPT = """
+var timeoutMs = arguments[1], pollMs = arguments[2], args = arguments[0];
+var condition = function() { %s };
+return new Promise(function(resolve) {
+    var deadline = Date.now() + timeoutMs;
+    var check = function() {
+        var result;
+        try { result = condition(); } catch (e) { result = null; }
+        if (result !== null && result !== undefined && result !== false) { resolve(result); return; }
+        if (Date.now() >= deadline) { resolve(null); return; }
+        setTimeout(check, pollMs);
+    };
+    check();
+});
+"""
+
+
+def _list_targets(debugger_address: str) -> List[Dict[str, Any]]:
+    with urlopen(f"http://{debugger_address}/json/list", timeout=10) as response:
+        return json.loads(response.read().decode('utf-8'))
+
+
+class CdpSession:
+    """一个标签页的CDP连接，多个命令可以同时等待响应"""
+
+    def __init__(self, websocket):
+        self._websocket = websocket
+        self._ids = itertools.count(1)
+        self._pending: Dict[int, asyncio.Future] = {}
+        self._reader = asyncio.get_running_loop().create_task(self._read())
+
+    @classmethod
+    async def connect(cls, driver: webdriver.Chrome) -> "CdpSession":
+        """连接到driver当前窗口所在的标签页"""
+        if websockets is None:
+            raise ImportError("异步页面对象需要安装websockets: pip install websockets")
+        debugger_address = driver.capabilities.get('goog:chromeOptions', {}).get('debuggerAddress')
+        if not debugger_address:
+            raise IllegalStateError("当前浏览器不支持CDP连接（需要Chrome）")
+
+        # ChromeDriver的窗口句柄就是DevTools的目标ID
+        handle = driver.current_window_handle
+        targets = await asyncio.to_thread(_list_targets, debugger_address)
+        target = next((target for target in targets if target.get('id') == handle), None)
+        if target is None:
+            raise IllegalStateError(f"找不到窗口对应的CDP目标: {handle}")
+        websocket = await websockets.connect(target['webSocketDebuggerUrl'], max_size=None)
+        return cls(websocket)
+
+    async def send(self, method: str, params: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """发送CDP命令并等待其响应"""
+        command_id = next(self._ids)
+        future = asyncio.get_running_loop().create_future()
+        self._pending[command_id] = future
+        await self._websocket.send(json.dumps({'id': command_id, 'method': method, 'params': params or {}}))
+        return await future
+
+    async def _read(self) -> None:
+        """按id把响应分发给等待中的命令，忽略事件通知"""
+        error: BaseException = ConnectionError("CDP连接已关闭")
+        try:
+            async for message in self._websocket:
+                data = json.loads(message)
+                future = self._pending.pop(data.get('id'), None)
+                if future is None or future.done():
+                    continue
+                if 'error' in data:
+                    future.set_exception(CdpError(data['error'].get('message', str(data['error']))))
+                else:
+                    future.set_result(data.get('result', {}))
+        except Exception as e:
+            error = e
+        finally:
+            for future in self._pending.values():
+                if not future.done():
+                    future.set_exception(error)
+            self._pending.clear()
+
+    async def close(self) -> None:
+        self._reader.cancel()
+        await self._websocket.close()
+
+
+class AsyncBasePage:
+    """异步页面对象基类，方法与BasePage对应"""
+
+    POLL_FREQUENCY = BasePage.POLL_FREQUENCY
+
+    def __init__(self, session: CdpSession, timeout: int = 10):
+        self.session = session
+        self.timeout = timeout
+        self.poll_frequency = self.POLL_FREQUENCY
+
+    @classmethod
+    async def attach(cls, driver: webdriver.Chrome, timeout: int = 10) -> "AsyncBasePage":
+        """连接到driver当前的标签页，并等待页面就绪"""
+        page = cls(await CdpSession.connect(driver), timeout)
+        await page.wait_until_ready()
+        return page
+
+    async def wait_until_ready(self) -> None:
+        """等待页面就绪，子类中等待并验证页面标题"""
+        pass
+
+    async def close(self) -> None:
+        """关闭CDP连接，不影响浏览器和driver"""
+        await self.session.close()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.close()
+
+    # ================== 脚本执行 ==================
+
+    async def execute_script(self, script: str, *args) -> Any:
+        """在页面中执行脚本，写法与driver.execute_script相同；脚本返回Promise时等待其结果"""
+        expression = _CALL_SCRIPT % (FIND_ELEMENT_JS, script, json.dumps(list(args)))
+        result = await self.session.send('Runtime.evaluate', {
+            'expression': expression,
+            'returnByValue': True,
+            'awaitPromise': True,
+        })
+        if 'exceptionDetails' in result:
+            details = result['exceptionDetails']
+            message = details.get('exception', {}).get('description') or details.get('text')
+            raise JavascriptException(message)
+        return result.get('result', {}).get('value')
+
+    async def wait_for_js_condition(self, condition: str, *args, timeout: Optional[int] = None) -> Any:
+        """在页面内等待JS条件成立（写法与BasePage.wait_for_js_condition相同）"""
+        wait_time = timeout or self.timeout
+        result = await self.execute_script(
+            _WAIT_SCRIPT % condition,
+            list(args),
+            int(wait_time * 1000),
+            max(int(self.poll_frequency * 1000), 10)
+        )
+        if result is None:
+            raise TimeoutException(f"等待页面条件超时: {condition.strip()}")
+        return result
+
+    # ================== 页面与元素 ==================
+
+    async def get_title(self) -> str:
+        return await self.execute_script("return document.title;")
+
+    async def wait_for_title_contains(self, title: str, timeout: Optional[int] = None) -> None:
+        await self.wait_for_js_condition("return document.title.indexOf(args[0]) >= 0;", title, timeout=timeout)
+
+    async def verify_page_title(self, expected_title: str) -> None:
+        actual_title = await self.get_title()
+        if expected_title not in actual_title:
+            raise IllegalStateError(f"错误页面: {actual_title}")
+
+    async def wait_for_text_matches(self, locator: Tuple[By, str], pattern: str = r'.+',
+                                    timeout: Optional[int] = None) -> None:
+        """等待元素文本匹配正则表达式"""
+        try:
+            await self.wait_for_js_condition(
+                "var el = findElement(args[0], args[1]);"
+                "return el !== null && new RegExp(args[2]).test(el.innerText);",
+                locator[0], locator[1], pattern, timeout=timeout
+            )
+        except TimeoutException:
+            raise ElementNotFoundError(f"元素文本未就绪: {locator}")
+
+    async def get_property(self, locator: Tuple[By, str], property_name: str,
+                           timeout: Optional[int] = None) -> Any:
+        """等待元素出现后读取属性值"""
+        try:
+            found = await self.wait_for_js_condition(
+                "var el = findElement(args[0], args[1]);"
+                "return el === null ? null : {value: args[2] === 'innerText' ? el.innerText.trim() : el[args[2]]};",
+                locator[0], locator[1], property_name, timeout=timeout
+            )
+        except TimeoutException:
+            raise ElementNotFoundError(f"元素未找到: {locator}")
+        return found['value']
+
+    async def get_text(self, locator: Tuple[By, str], timeout: Optional[int] = None) -> str:
+        return await self.get_property(locator, 'innerText', timeout)
+
+    async def get_texts(self, locators: Dict[str, Tuple[By, str]], wait_until_filled: bool = False,
+                        timeout: Optional[int] = None) -> Dict[str, Optional[str]]:
+        """一次脚本调用读取多个元素的文本，参数与BasePage.get_texts相同"""
+        fields = {name: list(locator) for name, locator in locators.items()}
+        if not wait_until_filled:
+            return await self.execute_script(READ_FIELDS_JS + "return readFields(arguments[0], 'innerText', false);",
+                                             fields)
+        try:
+            return await self.wait_for_js_condition(
+                READ_FIELDS_JS + "return readFields(args[0], 'innerText', true);",
+                fields, timeout=timeout
+            )
+        except TimeoutException:
+            raise ElementNotFoundError(f"元素文本未就绪: {list(locators.values())}")
+
+    async def click_element(self, locator: Tuple[By, str], timeout: Optional[int] = None) -> None:
+        """等待元素可见后点击"""
+        try:
+            await self.wait_for_js_condition(
+                "var el = findElement(args[0], args[1]);"
+                "if (el === null || el.disabled || el.getClientRects().length === 0) { return null; }"
+                "el.click(); return true;",
+                locator[0], locator[1], timeout=timeout
+            )
+        except TimeoutException:
+            raise ElementNotFoundError(f"可点击元素未找到: {locator}")
+
+    async def set_field_values(self, fields: List[Tuple[Tuple[By, str], Any]]) -> None:
+        """一次脚本调用按顺序设置多个表单字段，参数与BasePage.set_field_values相同"""
+        payload = [[locator[0], locator[1], value] for locator, value in fields]
+        missing = await self.execute_script(SET_FIELDS_SCRIPT, payload)
+        if missing:
+            raise ElementNotFoundError(f"元素未找到: {[fields[i][0] for i in missing]}")
+
+
+def run_async(coroutine, timeout: Optional[float] = None) -> Any:
+    """在同步代码（如pytest测试）中执行异步页面操作"""
+    return asyncio.run(asyncio.wait_for(coroutine, timeout))
+
+
+# ================== 自定义异常 ==================
+
+class CdpError(Exception):
+    """CDP命令返回错误"""
+    pass
@@ -1,17 +1,133 @@
+import os
 from selenium.webdriver.support.ui import WebDriverWait, Select
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.common.by import By
 from selenium.webdriver.remote.webelement import WebElement
-from selenium.common.exceptions import TimeoutException, NoSuchElementException
+from selenium.common.exceptions import TimeoutException, NoSuchElementException, StaleElementReferenceException
 from selenium import webdriver
-from typing import Optional, List, Tuple, Union
+from typing import Any, Callable, Dict, Optional, List, Tuple, Union
+from common.wait_engine import get_wait, condition
+
+# 在页面中按Selenium定位符查找元素的JS函数，供注入脚本使用
+FIND_ELEMENT_JS = """
+function findElement(by, value) {
+    switch (by) {
+        case 'id': return document.getElementById(value);
+        case 'css selector': return document.querySelector(value);
+        case 'class name': return document.getElementsByClassName(value)[0] || null;
+        case 'tag name': return document.getElementsByTagName(value)[0] || null;
+        case 'name': return document.getElementsByName(value)[0] || null;
+        case 'xpath':
+            return document.evaluate(value, document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+        case 'link text':
+            return Array.prototype.find.call(document.links, function(a) { return a.innerText.trim() === value; }) || null;
+        case 'partial link text':
+            return Array.prototype.find.call(document.links, function(a) { return a.innerText.indexOf(value) >= 0; }) || null;
+    }
+    throw new Error('不支持的定位方式: ' + by);
+}
+"""
+
+# 批量读取元素文本/属性的JS函数（供注入脚本使用）；require_filled为true时任一元素不存在或文本为空都返回null
+READ_FIELDS_JS = """
+function readFields(fields, prop, requireFilled) {
+    var result = {};
+    for (var name in fields) {
+        var el = findElement(fields[name][0], fields[name][1]);
+        if (el === null) {
+            if (requireFilled) { return null; }
+            result[name] = null;
+            continue;
+        }
+        var value = prop === 'innerText' ? el.innerText.trim() : el[prop];
+        if (requireFilled && prop === 'innerText' && value === '') { return null; }
+        result[name] = value;
+    }
+    return result;
+}
+"""
+
+_READ_FIELDS_SCRIPT = FIND_ELEMENT_JS + READ_FIELDS_JS + """
+return readFields(arguments[0], arguments[1], false);
+"""
+
+# 批量设置表单字段并触发input/change事件，返回找不到的定位符序号
+SET_FIELDS_SCRIPT = FIND_ELEMENT_JS + """
+var fields = arguments[0], missing = [];
+for (var i = 0; i < fields.length; i++) {
+    var el = findElement(fields[i][0], fields[i][1]), value = fields[i][2];
+    if (el === null) { missing.push(i); continue; }
+    if (el.type === 'checkbox' || el.type === 'radio') {
+        el.checked = !!value;
+    } else {
+        el.value = value;
+    }
+    el.dispatchEvent(new Event('input', {bubbles: true}));
+    el.dispatchEvent(new Event('change', {bubbles: true}));
+}
+return missing;
+"""
+
+# 返回多个定位符中第一个存在的元素及其序号，都不存在时返回null
+_FIND_FIRST_CONDITION = """
+for (var i = 0; i < args.length; i++) {
+    var el = findElement(args[i][0], args[i][1]);
+    if (el !== null) { return [i, el]; }
+}
+return null;
+"""
+
+_FIND_FIRST_SCRIPT = FIND_ELEMENT_JS + "var args = arguments[0];" + _FIND_FIRST_CONDITION
+
+# 在页面内等待条件成立的异步脚本：DOM变化时立即重新检查，同时按轮询间隔兜底检查
+# （属性值等变化不会触发MutationObserver），超时后返回null
+_WAIT_FOR_CONDITION_JS = FIND_ELEMENT_JS + """
+var callback = arguments[arguments.length - 1];
+var args = arguments[0], timeoutMs = arguments[1], pollMs = arguments[2];
+var condition = function() { %s };
+var done = false, observer = null, timer = null, interval = null;
+var finish = function(result) {
+    if (done) { return; }
+    done = true;
+    if (observer) { observer.disconnect(); }
+    clearTimeout(timer);
+    clearInterval(interval);
+    callback(result);
+};
+var check = function() {
+    var result;
+    try { result = condition(); } catch (e) { result = null; }
+    if (result !== null && result !== undefined && result !== false) { finish(result); }
+};
+check();
+if (!done) {
+    observer = new MutationObserver(check);
+    observer.observe(document, {childList: true, subtree: true, attributes: true, characterData: true});
+    interval = setInterval(check, pollMs);
+    timer = setTimeout(function() { finish(null); }, timeoutMs);
+}
+"""
 
 
 class BasePage:
-    def __init__(self, driver: webdriver.Chrome, timeout: int = 10):
+    # 等待条件的轮询间隔（秒），WebDriverWait默认的0.5秒会让等待最多晚返回半秒
+    POLL_FREQUENCY = float(os.getenv('WAIT_POLL_FREQUENCY', '0.05'))
+
+    def __init__(self, driver: webdriver.Chrome, timeout: int = 10, poll_frequency: Optional[float] = None):
         self.driver = driver
-        self.wait = WebDriverWait(driver, timeout)
         self.timeout = timeout
+        self.poll_frequency = poll_frequency or self.POLL_FREQUENCY
+        # 元素缓存：定位符 -> WebElement，元素失效（页面跳转或重新渲染）时自动重新查找
+        self._element_cache: Dict[Tuple[By, str], WebElement] = {}
+    
+    @property
+    def wait(self) -> WebDriverWait:
+        """默认超时的WebDriverWait"""
+        return self._wait()
+    
+    def _wait(self, timeout: Optional[int] = None) -> WebDriverWait:
+        """获取使用细粒度轮询间隔的共享WebDriverWait"""
+        return get_wait(self.driver, timeout or self.timeout, self.poll_frequency)
     
     def wait_for_title_contains(self, title: str) -> None:
         """等待页面标题包含指定文本"""
@@ -23,25 +139,89 @@ class BasePage:
         if not actual_title or not actual_title.startswith(expected_title):
             raise IllegalStateError(f"错误页面: {actual_title}")
     
+    # ================== 就绪等待 ==================
+    
+    def wait_for_js_condition(self, condition: str, *args, timeout: Optional[int] = None) -> Any:
+        """
+        在页面内等待JS条件成立，条件成立后立即返回而不是等到下一次轮询
+        
+        Args:
+            condition: JS函数体，可使用args数组和findElement(by, value)，
+                       返回null/undefined/false以外的值表示条件成立
+            args: 传给条件的参数
+            timeout: 超时时间（秒），需小于WebDriver的脚本超时（默认30秒）
+            
+        Returns:
+            条件返回的值
+        """
+        wait_time = timeout or self.timeout
+        result = self.driver.execute_async_script(
+            _WAIT_FOR_CONDITION_JS % condition,
+            list(args),
+            int(wait_time * 1000),
+            max(int(self.poll_frequency * 1000), 10)
+        )
+        if result is None:
+            raise TimeoutException(f"等待页面条件超时: {condition.strip()}")
+        return result
+    
+    def wait_for_text_matches(self, locator: Tuple[By, str], pattern: str = r'.+', timeout: Optional[int] = None) -> None:
+        """等待元素文本匹配正则表达式（如等待JS填充的文本出现）"""
+        try:
+            self.wait_for_js_condition(
+                "var el = findElement(args[0], args[1]);"
+                " return el !== null && new RegExp(args[2]).test(el.innerText);",
+                locator[0], locator[1], pattern,
+                timeout=timeout
+            )
+        except TimeoutException:
+            raise ElementNotFoundError(f"元素文本未就绪: {locator}")
+    
+    def wait_for_window_count(self, count: int, timeout: Optional[int] = None) -> None:
+        """等待浏览器窗口数量达到指定值"""
+        self._wait(timeout).until(lambda driver: len(driver.window_handles) == count)
+    
     # ================== 元素定位封装 ==================
     # 使用元组作为参数
     def find_element(self, locator: Tuple[By, str], timeout: Optional[int] = None) -> WebElement:
-        """查找单个元素，带等待机制"""
-        wait_time = timeout or self.timeout
+        """查找单个元素，带等待机制；已找到过的元素直接从缓存返回"""
+        element = self._element_cache.get(locator)
+        if element is not None:
+            return element
         try:
-            element = WebDriverWait(self.driver, wait_time).until(
-                EC.presence_of_element_located(locator)
+            element = self._wait(timeout).until(
+                condition('presence', locator)
             )
-            return element
         except TimeoutException:
             raise ElementNotFoundError(f"元素未找到: {locator}")
+        self._element_cache[locator] = element
+        return element
+    
+    def with_element(self, locator: Tuple[By, str], action: Callable[[WebElement], Any], timeout: Optional[int] = None) -> Any:
+        """
+        对元素执行操作，缓存的元素已失效时重新查找并重试一次
+        
+        Args:
+            locator: 元素定位符
+            action: 接收WebElement的操作
+            timeout: 查找元素的超时时间
+        """
+        element = self.find_element(locator, timeout)
+        try:
+            return action(element)
+        except StaleElementReferenceException:
+            self._element_cache.pop(locator, None)
+            return action(self.find_element(locator, timeout))
+    
+    def clear_element_cache(self) -> None:
+        """清空元素缓存"""
+        self._element_cache.clear()
     
     def find_elements(self, locator: Tuple[By, str], timeout: Optional[int] = None) -> List[WebElement]:
         """查找多个元素，带等待机制"""
-        wait_time = timeout or self.timeout
         try:
-            WebDriverWait(self.driver, wait_time).until(
-                EC.presence_of_element_located(locator)
+            self._wait(timeout).until(
+                condition('presence', locator)
             )
             return self.driver.find_elements(*locator)
         except TimeoutException:
@@ -49,10 +229,9 @@ class BasePage:
     
     def find_clickable_element(self, locator: Tuple[By, str], timeout: Optional[int] = None) -> WebElement:
         """查找可点击的元素"""
-        wait_time = timeout or self.timeout
         try:
-            element = WebDriverWait(self.driver, wait_time).until(
-                EC.element_to_be_clickable(locator)
+            element = self._wait(timeout).until(
+                condition('clickable', locator)
             )
             return element
         except TimeoutException:
@@ -60,10 +239,9 @@ class BasePage:
     
     def wait_for_element_visible(self, locator: Tuple[By, str], timeout: Optional[int] = None) -> WebElement:
         """等待元素可见"""
-        wait_time = timeout or self.timeout
         try:
-            element = WebDriverWait(self.driver, wait_time).until(
-                EC.visibility_of_element_located(locator)
+            element = self._wait(timeout).until(
+                condition('visible', locator)
             )
             return element
         except TimeoutException:
@@ -71,10 +249,9 @@ class BasePage:
     
     def wait_for_element_disappear(self, locator: Tuple[By, str], timeout: Optional[int] = None) -> bool:
         """等待元素消失"""
-        wait_time = timeout or self.timeout
         try:
-            WebDriverWait(self.driver, wait_time).until_not(
-                EC.presence_of_element_located(locator)
+            self._wait(timeout).until_not(
+                condition('presence', locator)
             )
             return True
         except TimeoutException:
@@ -88,13 +265,98 @@ class BasePage:
         except NoSuchElementException:
             return False
     
+    def expect_absent(self, locator: Tuple[By, str]) -> bool:
+        """
+        检查元素不存在，只查询一次而不等待超时
+        
+        用于页面已就绪后的否定检查；find_elements在元素不存在时会等满整个超时时间
+        """
+        return not self.driver.find_elements(*locator)
+    
+    def find_first(self, locators: List[Tuple[By, str]], timeout: Optional[float] = None) -> Optional[Tuple[int, WebElement]]:
+        """
+        在一次JS调用中同时查找多个定位符，返回最先找到的元素
+        
+        Args:
+            locators: 按优先级排列的定位符，同时存在时返回靠前的
+            timeout: 等待任一元素出现的超时时间（秒），为0时只查询一次
+            
+        Returns:
+            (定位符序号, 元素)，都不存在时返回None
+        """
+        args = [list(locator) for locator in locators]
+        if timeout == 0:
+            result = self.driver.execute_script(_FIND_FIRST_SCRIPT, args)
+            return tuple(result) if result else None
+        try:
+            return tuple(self.wait_for_js_condition(_FIND_FIRST_CONDITION, *args, timeout=timeout))
+        except TimeoutException:
+            return None
+    
     def is_element_visible(self, locator: Tuple[By, str]) -> bool:
-        """检查元素是否可见"""
+        """检查元素是否可见，优先使用缓存的元素"""
+        element = self._element_cache.get(locator)
+        if element is not None:
+            try:
+                return element.is_displayed()
+            except StaleElementReferenceException:
+                self._element_cache.pop(locator, None)
         try:
             element = self.driver.find_element(*locator)
-            return element.is_displayed()
         except NoSuchElementException:
             return False
+        self._element_cache[locator] = element
+        return element.is_displayed()
+    
+    # ================== 批量读取 ==================
+    
+    def get_texts(self, locators: Dict[str, Tuple[By, str]], wait_until_filled: bool = False,
+                  timeout: Optional[int] = None) -> Dict[str, Optional[str]]:
+        """
+        一次JS调用读取多个元素的文本
+        
+        Args:
+            locators: 字段名 -> 定位符
+            wait_until_filled: 为True时等待所有元素存在且文本非空（如等待JS填充页面数据）
+            timeout: wait_until_filled时的超时时间
+            
+        Returns:
+            字段名 -> 文本，元素不存在时为None
+        """
+        return self._read_fields(locators, "innerText", wait_until_filled, timeout)
+    
+    def get_properties(self, locators: Dict[str, Tuple[By, str]], property_name: str) -> Dict[str, Any]:
+        """一次JS调用读取多个元素的同一属性值，元素不存在时为None"""
+        return self._read_fields(locators, property_name, False, None)
+    
+    def _read_fields(self, locators: Dict[str, Tuple[By, str]], prop: str, wait_until_filled: bool,
+                     timeout: Optional[int]) -> Dict[str, Any]:
+        fields = {name: list(locator) for name, locator in locators.items()}
+        if not wait_until_filled:
+            return self.driver.execute_script(_READ_FIELDS_SCRIPT, fields, prop)
+        try:
+            return self.wait_for_js_condition(
+                READ_FIELDS_JS + "return readFields(args[0], args[1], true);",
+                fields, prop,
+                timeout=timeout
+            )
+        except TimeoutException:
+            raise ElementNotFoundError(f"元素文本未就绪: {list(locators.values())}")
+    
+    # ================== 批量填写 ==================
+    
+    def set_field_values(self, fields: List[Tuple[Tuple[By, str], Any]]) -> None:
+        """
+        一次JS调用按顺序设置多个表单字段的值，并触发input和change事件
+        
+        Args:
+            fields: (定位符, 值) 列表；复选框和单选框的值为是否选中，其他元素的值为value
+        """
+        payload = [[locator[0], locator[1], value] for locator, value in fields]
+        missing = self.driver.execute_script(SET_FIELDS_SCRIPT, payload)
+        if missing:
+            raise ElementNotFoundError(f"元素未找到: {[fields[i][0] for i in missing]}")
+    
     # ================== 元素操作封装 ==================
     
     def click_element(self, locator: Tuple[By, str], timeout: Optional[int] = None) -> None:
@@ -104,58 +366,50 @@ class BasePage:
     
     def input_text(self, locator: Tuple[By, str], text: str, clear_first: bool = True, timeout: Optional[int] = None) -> None:
         """输入文本到元素"""
-        element = self.find_element(locator, timeout)
-        if clear_first:
-            element.clear()
-        element.send_keys(text)
+        def action(element: WebElement) -> None:
+            if clear_first:
+                element.clear()
+            element.send_keys(text)
+        self.with_element(locator, action, timeout)
     
     def get_text(self, locator: Tuple[By, str], timeout: Optional[int] = None) -> str:
         """获取元素文本"""
-        element = self.find_element(locator, timeout)
-        return element.text
+        return self.with_element(locator, lambda element: element.text, timeout)
     
     def get_attribute(self, locator: Tuple[By, str], attribute_name: str, timeout: Optional[int] = None) -> str:
         """获取元素属性"""
-        element = self.find_element(locator, timeout)
-        return element.get_attribute(attribute_name)
+        return self.with_element(locator, lambda element: element.get_attribute(attribute_name), timeout)
     
     def get_property(self, locator: Tuple[By, str], property_name: str, timeout: Optional[int] = None) -> str:
         """获取元素属性值"""
-        element = self.find_element(locator, timeout)
-        return element.get_property(property_name)
+        return self.with_element(locator, lambda element: element.get_property(property_name), timeout)
     
     def get_css_value(self, locator: Tuple[By, str], css_property: str, timeout: Optional[int] = None) -> str:
         """获取元素CSS值"""
-        element = self.find_element(locator, timeout)
-        return element.value_of_css_property(css_property)
+        return self.with_element(locator, lambda element: element.value_of_css_property(css_property), timeout)
     
     def select_dropdown_by_value(self, locator: Tuple[By, str], value: str, timeout: Optional[int] = None) -> None:
         """通过值选择下拉框选项"""
-        element = self.find_element(locator, timeout)
-        select = Select(element)
-        select.select_by_value(value)
+        self.with_element(locator, lambda element: Select(element).select_by_value(value), timeout)
     
     def select_dropdown_by_text(self, locator: Tuple[By, str], text: str, timeout: Optional[int] = None) -> None:
         """通过文本选择下拉框选项"""
-        element = self.find_element(locator, timeout)
-        select = Select(element)
-        select.select_by_visible_text(text)
+        self.with_element(locator, lambda element: Select(element).select_by_visible_text(text), timeout)
     
     def set_checkbox(self, locator: Tuple[By, str], checked: bool, timeout: Optional[int] = None) -> None:
         """设置复选框状态"""
-        element = self.find_element(locator, timeout)
-        if element.is_selected() != checked:
-            element.click()
+        def action(element: WebElement) -> None:
+            if element.is_selected() != checked:
+                element.click()
+        self.with_element(locator, action, timeout)
     
     def is_checkbox_checked(self, locator: Tuple[By, str], timeout: Optional[int] = None) -> bool:
         """检查复选框是否选中"""
-        element = self.find_element(locator, timeout)
-        return element.is_selected()
+        return self.with_element(locator, lambda element: element.is_selected(), timeout)
     
     def execute_script_on_element(self, script: str, locator: Tuple[By, str], *args, timeout: Optional[int] = None):
         """在元素上执行JavaScript"""
-        element = self.find_element(locator, timeout)
-        return self.driver.execute_script(script, element, *args)
+        return self.with_element(locator, lambda element: self.driver.execute_script(script, element, *args), timeout)
 
 # ================== 自定义异常 ==================
 
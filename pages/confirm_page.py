@@ -1,7 +1,6 @@
-import re
 from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
 from pages.base_page import BasePage
+from typing import Dict
 import allure
 
 # ================== 确认页面定位符 ==================
@@ -21,6 +20,18 @@ SUCCESS_MODAL = (By.ID, "success-modal")
 MODAL_MESSAGE = (By.CSS_SELECTOR, "#success-modal > div > div > .modal-body")
 CLOSE_BUTTON = (By.CSS_SELECTOR, "#success-modal > div > div > div > button.btn-success")
 
+# snapshot读取的字段
+SNAPSHOT_FIELDS = {
+    "total_bill": TOTAL_BILL_TEXT,
+    "plan_name": PLAN_NAME_TEXT,
+    "term": TERM_TEXT,
+    "head_count": HEAD_COUNT_TEXT,
+    "plans": PLANS_TEXT,
+    "username": USERNAME_TEXT,
+    "contact": CONTACT_TEXT,
+    "comment": COMMENT_TEXT,
+}
+
 
 class ConfirmPage(BasePage):
     """确认页面对象"""
@@ -30,44 +41,48 @@ class ConfirmPage(BasePage):
         self.wait_for_title_contains("Confirm Reservation")
         self.verify_page_title("Confirm Reservation")
     
+    def snapshot(self) -> Dict[str, str]:
+        """等待预订信息填充完成后一次读取所有字段，键名与get_xxx方法对应"""
+        return self.get_texts(SNAPSHOT_FIELDS, wait_until_filled=True)
+    
     def get_total_bill(self) -> str:
         """获取总金额"""
-        self.wait.until(lambda driver: re.search(r'.+', self.get_text(TOTAL_BILL_TEXT)))
+        self.wait_for_text_matches(TOTAL_BILL_TEXT)
         return self.get_text(TOTAL_BILL_TEXT)
     
     def get_plan_name(self) -> str:
         """获取计划名称"""
-        self.wait.until(lambda driver: re.search(r'.+', self.get_text(PLAN_NAME_TEXT)))
+        self.wait_for_text_matches(PLAN_NAME_TEXT)
         return self.get_text(PLAN_NAME_TEXT)
     
     def get_term(self) -> str:
         """获取预订时间段"""
-        self.wait.until(lambda driver: re.search(r'.+', self.get_text(TERM_TEXT)))
+        self.wait_for_text_matches(TERM_TEXT)
         return self.get_text(TERM_TEXT)
     
     def get_head_count(self) -> str:
         """获取人数"""
-        self.wait.until(lambda driver: re.search(r'.+', self.get_text(HEAD_COUNT_TEXT)))
+        self.wait_for_text_matches(HEAD_COUNT_TEXT)
         return self.get_text(HEAD_COUNT_TEXT)
     
     def get_plans(self) -> str:
         """获取选择的计划"""
-        self.wait.until(lambda driver: re.search(r'.+', self.get_text(PLANS_TEXT)))
+        self.wait_for_text_matches(PLANS_TEXT)
         return self.get_text(PLANS_TEXT)
     
     def get_username(self) -> str:
         """获取用户名"""
-        self.wait.until(lambda driver: re.search(r'.+', self.get_text(USERNAME_TEXT)))
+        self.wait_for_text_matches(USERNAME_TEXT)
         return self.get_text(USERNAME_TEXT)
     
     def get_contact(self) -> str:
         """获取联系方式"""
-        self.wait.until(lambda driver: re.search(r'.+', self.get_text(CONTACT_TEXT)))
+        self.wait_for_text_matches(CONTACT_TEXT)
         return self.get_text(CONTACT_TEXT)
     
     def get_comment(self) -> str:
         """获取备注"""
-        self.wait.until(lambda driver: re.search(r'.+', self.get_text(COMMENT_TEXT)))
+        self.wait_for_text_matches(COMMENT_TEXT)
         return self.get_text(COMMENT_TEXT)
     
     @allure.step("确认预订")
@@ -1,8 +1,12 @@
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.color import Color
 from pages.base_page import BasePage
+from common.utils import Utils
 from pathlib import Path
 
+# ================== 页面地址 ==================
+ICON_PATH = "/icon.html"
+
 # ================== 图标页面定位符 ==================
 ICON_INPUT = (By.ID, "icon")
 ZOOM_INPUT = (By.ID, "zoom")
@@ -17,6 +21,12 @@ class IconPage(BasePage):
         self.wait_for_title_contains("Setting Icon")
         self.verify_page_title("Setting Icon")
     
+    @classmethod
+    def open(cls, driver) -> "IconPage":
+        """直接打开图标设置页面（需要已登录）"""
+        driver.get(Utils.BASE_URL + ICON_PATH)
+        return cls(driver)
+    
     def set_icon(self, file_path: Path) -> None:
         """设置图标文件"""
         self.input_text(ICON_INPUT, str(file_path.absolute()), clear_first=False)
@@ -2,6 +2,12 @@ from selenium.webdriver.common.by import By
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.support.color import Color
 from pages.base_page import BasePage
+from pages.async_base_page import AsyncBasePage
+from common.utils import Utils
+from typing import Dict
+
+# ================== 页面地址 ==================
+MYPAGE_PATH = "/mypage.html"
 
 # ================== 个人页面定位符 ==================
 HEADER = (By.TAG_NAME, "h2")
@@ -14,6 +20,18 @@ GENDER_TEXT = (By.ID, "gender")
 BIRTHDAY_TEXT = (By.ID, "birthday")
 NOTIFICATION_TEXT = (By.ID, "notification")
 
+# snapshot读取的用户信息字段
+SNAPSHOT_FIELDS = {
+    "email": EMAIL_TEXT,
+    "username": USERNAME_TEXT,
+    "rank": RANK_TEXT,
+    "address": ADDRESS_TEXT,
+    "tel": TEL_TEXT,
+    "gender": GENDER_TEXT,
+    "birthday": BIRTHDAY_TEXT,
+    "notification": NOTIFICATION_TEXT,
+}
+
 # 导航链接
 RESERVE_LINK = (By.LINK_TEXT, "Reserve")
 ICON_LINK = (By.ID, "icon-link")
@@ -31,6 +49,12 @@ class MyPage(BasePage):
         self.wait_for_title_contains("MyPage")
         self.verify_page_title("MyPage")
     
+    @classmethod
+    def open(cls, driver) -> "MyPage":
+        """直接打开个人页面（需要已登录）"""
+        driver.get(Utils.BASE_URL + MYPAGE_PATH)
+        return cls(driver)
+    
     def go_to_plans_page(self):
         """导航到方案页面"""
         self.click_element(RESERVE_LINK)
@@ -51,6 +75,10 @@ class MyPage(BasePage):
         """获取页面标题文本"""
         return self.get_text(HEADER)
     
+    def snapshot(self) -> Dict[str, str]:
+        """等待用户信息填充完成后一次读取所有字段，键名与get_xxx方法对应"""
+        return self.get_texts(SNAPSHOT_FIELDS, wait_until_filled=True)
+    
     def get_email(self) -> str:
         """获取邮箱信息"""
         return self.get_text(EMAIL_TEXT)
@@ -84,9 +112,9 @@ class MyPage(BasePage):
         return self.get_text(NOTIFICATION_TEXT)
     
     def exists_icon_image(self) -> bool:
-        """检查图标图片是否存在"""
-        elements = self.find_elements(ICON_IMAGE)
-        return len(elements) > 0
+        """检查图标图片是否存在：等待用户信息填充完成（图标与其同时渲染）后只查询一次"""
+        self.wait_for_text_matches(EMAIL_TEXT, r'\S+')
+        return not self.expect_absent(ICON_IMAGE)
     
     def get_icon_image_width(self) -> int:
         """获取图标图片宽度"""
@@ -102,4 +130,16 @@ class MyPage(BasePage):
     
     def delete_user(self) -> None:
         """删除用户账户"""
-        self.click_element(DELETE_BUTTON) 
\ No newline at end of file
+        self.click_element(DELETE_BUTTON)
+
+
+class AsyncMyPage(AsyncBasePage):
+    """个人页面的异步版本"""
+    
+    async def wait_until_ready(self) -> None:
+        await self.wait_for_title_contains("MyPage")
+        await self.verify_page_title("MyPage")
+    
+    async def snapshot(self) -> Dict[str, str]:
+        """等待用户信息填充完成后一次读取所有字段，与MyPage.snapshot相同"""
+        return await self.get_texts(SNAPSHOT_FIELDS, wait_until_filled=True)
@@ -1,6 +1,17 @@
+import re
+from selenium.common.exceptions import StaleElementReferenceException
 from selenium.webdriver.common.by import By
+from selenium.webdriver.remote.webelement import WebElement
 from pages.base_page import BasePage
-from typing import List
+from common.utils import Utils
+from decimal import Decimal
+from typing import Dict, List, NamedTuple, Optional
+
+# ================== 页面地址 ==================
+PLANS_PATH = "/plans.html"
+PLAN_ID_PATTERN = re.compile(r"plan-id=(\d+)")
+# 卡片文本中的金额：英文站点如 $1,000.00，日文站点如 7,000円
+PLAN_PRICE_PATTERN = re.compile(r"\$([\d,]+(?:\.\d+)?)|([\d,]+(?:\.\d+)?)円")
 
 # ================== 方案页面定位符 ==================
 LOADING_INDICATOR = (By.CSS_SELECTOR, "#plan-list > div[role=\"status\"]")
@@ -8,39 +19,113 @@ PLAN_CARDS = (By.CLASS_NAME, "card")
 PLAN_TITLES = (By.CLASS_NAME, "card-title")
 PLAN_LINK = (By.TAG_NAME, "a")
 
+# 一次读取所有方案卡片的标题、链接和卡片文本
+_PLAN_INDEX_SCRIPT = """
+var cards = document.getElementsByClassName(arguments[0]), titleClass = arguments[1], linkTag = arguments[2];
+var plans = [];
+for (var i = 0; i < cards.length; i++) {
+    var title = cards[i].getElementsByClassName(titleClass)[0];
+    if (!title) { continue; }
+    var link = cards[i].getElementsByTagName(linkTag)[0] || null;
+    plans.push([title.innerText.trim(), link ? link.href : null, cards[i].innerText, link]);
+}
+return plans;
+"""
+
+
+class PlanEntry(NamedTuple):
+    """方案列表中的一个方案"""
+    title: str
+    plan_id: Optional[str]
+    href: Optional[str]
+    # 卡片中的第一个金额（站点语言对应的货币），没有时为None
+    price: Optional[Decimal]
+    link: Optional[WebElement]
+
 
 class PlansPage(BasePage):
+    # 方案标题 -> 方案ID，整个会话共享，只在遇到未知标题时重新读取方案列表
+    _plan_id_index: Dict[str, str] = {}
+    
     def __init__(self, driver):
         super().__init__(driver)
+        # 当前页面的方案列表，第一次查询时读取
+        self._plans: Optional[List[PlanEntry]] = None
         self.wait_for_title_contains("Plans")
         self.verify_page_title("Plans")
     
+    @classmethod
+    def open(cls, driver) -> "PlansPage":
+        """直接打开方案列表页面"""
+        driver.get(Utils.BASE_URL + PLANS_PATH)
+        return cls(driver)
+    
+    @classmethod
+    def get_plan_id(cls, driver, title: str) -> str:
+        """
+        根据方案标题获取方案ID
+        
+        索引中没有该标题时在当前窗口打开方案列表页面并更新索引，
+        会员专属方案需要先以对应会员身份登录。
+        """
+        if title not in cls._plan_id_index:
+            cls._plan_id_index.update(cls.open(driver).get_plan_ids())
+        if title not in cls._plan_id_index:
+            raise KeyError(f"找不到方案: {title}")
+        return cls._plan_id_index[title]
+    
+    def get_plans(self, refresh: bool = False) -> List[PlanEntry]:
+        """
+        获取当前页面的方案列表
+        
+        加载完成后用一次脚本调用读取所有卡片，同一页面对象上的后续查询直接使用结果
+        """
+        if self._plans is None or refresh:
+            # 等待加载完成
+            self.wait_for_element_disappear(LOADING_INDICATOR)
+            rows = self.driver.execute_script(_PLAN_INDEX_SCRIPT, PLAN_CARDS[1], PLAN_TITLES[1], PLAN_LINK[1])
+            self._plans = [self._to_entry(*row) for row in rows]
+        return self._plans
+    
+    @staticmethod
+    def _to_entry(title: str, href: Optional[str], card_text: str, link: Optional[WebElement]) -> PlanEntry:
+        plan_id = PLAN_ID_PATTERN.search(href or "")
+        price = PLAN_PRICE_PATTERN.search(card_text or "")
+        return PlanEntry(
+            title=title,
+            plan_id=plan_id.group(1) if plan_id else None,
+            href=href,
+            price=Decimal((price.group(1) or price.group(2)).replace(",", "")) if price else None,
+            link=link,
+        )
+    
+    def get_plan(self, title: str) -> Optional[PlanEntry]:
+        """根据标题获取方案，找不到时返回None"""
+        return next((plan for plan in self.get_plans() if plan.title == title), None)
+    
+    def get_plan_ids(self) -> Dict[str, str]:
+        """获取当前方案列表中 标题 -> 方案ID 的映射"""
+        return {plan.title: plan.plan_id for plan in self.get_plans() if plan.plan_id}
+    
+    def get_plan_prices(self) -> Dict[str, Decimal]:
+        """获取当前方案列表中 标题 -> 金额 的映射"""
+        return {plan.title: plan.price for plan in self.get_plans() if plan.price is not None}
+    
     def get_plan_titles(self) -> List[str]:
         """获取计划标题列表"""
-        # 等待加载完成
-        self.wait_for_element_disappear(LOADING_INDICATOR)
-        
-        # 获取所有计划标题
-        plan_elements = self.find_elements(PLAN_TITLES)
-        return [plan.text for plan in plan_elements]
+        return [plan.title for plan in self.get_plans()]
     
     def open_plan_by_title(self, title: str) -> None:
         """根据标题打开计划"""
-        # 等待加载完成
-        self.wait_for_element_disappear(LOADING_INDICATOR)
-        
-        # 获取所有计划卡片
-        plan_cards = self.find_elements(PLAN_CARDS)
-        
-        for plan_card in plan_cards:
-            # 在每个卡片中查找标题
-            title_elements = plan_card.find_elements(*PLAN_TITLES)
-            if title_elements and title_elements[0].text == title:
-                # 找到匹配的计划，点击链接
-                link_elements = plan_card.find_elements(*PLAN_LINK)
-                if link_elements:
-                    link_elements[0].click()
-                    break
+        plan = self.get_plan(title)
+        if plan is not None and plan.link is not None:
+            try:
+                plan.link.click()
+            except StaleElementReferenceException:
+                # 方案列表已重新渲染，重新读取后再点击
+                plan = next((p for p in self.get_plans(refresh=True) if p.title == title), None)
+                if plan is not None and plan.link is not None:
+                    plan.link.click()
         
         # 等待新窗口打开
-        self.wait.until(lambda driver: len(driver.window_handles) == 2) 
\ No newline at end of file
+        self.wait_for_window_count(2)
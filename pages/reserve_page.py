@@ -2,10 +2,15 @@ from enum import Enum
 import time
 from selenium.webdriver.common.by import By
 from selenium.webdriver.common.keys import Keys
-from selenium.webdriver.support.ui import WebDriverWait
 from pages.base_page import BasePage
+from common.utils import Utils
+from common.wait_engine import get_wait
+from common.driver_pool import apply_resource_blocking
+from typing import Any, Dict
 import allure
-import re
+
+# ================== 页面地址 ==================
+RESERVE_PATH = "/reserve.html"
 
 # ================== 预订页面定位符 ==================
 # 基本信息字段
@@ -29,6 +34,31 @@ COMMENT_TEXTAREA = (By.ID, "comment")
 # 计划信息显示
 PLAN_NAME_TEXT = (By.ID, "plan-name")
 
+# fill_form中直接按值设置的字段，按填写顺序排列（联系方式在邮箱/电话之前，日期最后）
+FORM_FIELDS = {
+    "reserve_term": TERM_INPUT,
+    "head_count": HEAD_COUNT_INPUT,
+    "breakfast_plan": BREAKFAST_CHECKBOX,
+    "early_check_in_plan": EARLY_CHECKIN_CHECKBOX,
+    "sightseeing_plan": SIGHTSEEING_CHECKBOX,
+    "username": USERNAME_INPUT,
+    "contact": CONTACT_SELECT,
+    "email": EMAIL_INPUT,
+    "tel": TEL_INPUT,
+    "comment": COMMENT_TEXTAREA,
+    "reserve_date": DATE_INPUT,
+}
+
+# snapshot读取的输入框字段
+SNAPSHOT_FIELDS = {
+    "reserve_date": DATE_INPUT,
+    "reserve_term": TERM_INPUT,
+    "head_count": HEAD_COUNT_INPUT,
+    "username": USERNAME_INPUT,
+    "email": EMAIL_INPUT,
+    "tel": TEL_INPUT,
+}
+
 # 提交按钮
 SUBMIT_BUTTON = (By.CSS_SELECTOR, "button[data-test='submit-button']")
 
@@ -62,19 +92,44 @@ class ReservePage(BasePage):
         self.wait_for_title_contains("Reservation")
         self.verify_page_title("Reservation")
     
+    @classmethod
+    def open(cls, driver, plan_id: str, new_window: bool = False) -> "ReservePage":
+        """
+        直接打开指定方案的预订页面，跳过首页和方案列表页面
+
+        Args:
+            driver: WebDriver实例
+            plan_id: 方案ID，可通过PlansPage.get_plan_id按标题查询
+            new_window: 为True时像从方案列表点击一样在新窗口中打开，
+                        确认页面关闭时window.close()只对脚本打开的窗口有效
+        """
+        url = f"{Utils.BASE_URL}{RESERVE_PATH}?plan-id={plan_id}"
+        if new_window:
+            handles_before_open = set(driver.window_handles)
+            # 先打开空白窗口，切换过去设置资源屏蔽后再加载页面
+            driver.execute_script("window.open('about:blank')")
+            get_wait(driver, 10, cls.POLL_FREQUENCY).until(
+                lambda d: len(d.window_handles) > len(handles_before_open))
+            new_handle = Utils.get_new_window_handle(handles_before_open, set(driver.window_handles))
+            driver.switch_to.window(new_handle)
+            apply_resource_blocking(driver)
+        driver.get(url)
+        return cls(driver)
+    
     @allure.step("设置预订日期")
     def set_reserve_date(self, date: str):
         """设置预订日期"""
         # 对于日期输入框，需要特殊处理以确保完全清空
-        element = self.find_element(DATE_INPUT)
-        # 先清空
-        element.clear()
-        # 全选并删除，确保彻底清空
-        element.send_keys(Keys.CONTROL + "a")
-        element.send_keys(Keys.DELETE)
-        # 输入新日期
-        if date:  # 只有当日期不为空时才输入
-            element.send_keys(date)
+        def type_date(element):
+            # 先清空
+            element.clear()
+            # 全选并删除，确保彻底清空
+            element.send_keys(Keys.CONTROL + "a")
+            element.send_keys(Keys.DELETE)
+            # 输入新日期
+            if date:  # 只有当日期不为空时才输入
+                element.send_keys(date)
+        self.with_element(DATE_INPUT, type_date)
         
         try:
             # 尝试关闭日期选择器，如果失败则忽略
@@ -141,6 +196,44 @@ class ReservePage(BasePage):
         """设置备注"""
         self.input_text(COMMENT_TEXTAREA, comment)
     
+    @allure.step("填写预订表单")
+    def fill_form(self, data: Dict[str, Any], realistic_typing: bool = False):
+        """
+        填写预订表单，只填写data中出现的字段
+        
+        Args:
+            data: 键为FORM_FIELDS中的字段名，contact可以是Contact枚举或枚举值
+            realistic_typing: 为True时逐个字段模拟键盘输入（需要按键和焦点变化触发校验的测试使用），
+                              默认在一次JS调用中设置所有字段
+        """
+        values = dict(data)
+        if 'contact' in values:
+            values['contact'] = Contact(values['contact'])
+        
+        if realistic_typing:
+            # 日期最先输入，后续字段的输入使日期输入框失去焦点并触发校验
+            setters = {
+                'reserve_date': self.set_reserve_date,
+                'reserve_term': self.set_reserve_term,
+                'head_count': self.set_head_count,
+                'breakfast_plan': self.set_breakfast_plan,
+                'early_check_in_plan': self.set_early_check_in_plan,
+                'sightseeing_plan': self.set_sightseeing_plan,
+                'username': self.set_username,
+                'contact': self.set_contact,
+                'email': self.set_email,
+                'tel': self.set_tel,
+                'comment': self.set_comment,
+            }
+            for name, setter in setters.items():
+                if name in values:
+                    setter(values[name])
+            return
+        
+        if 'contact' in values:
+            values['contact'] = values['contact'].value
+        self.set_field_values([(locator, values[name]) for name, locator in FORM_FIELDS.items() if name in values])
+    
     @allure.step("跳转到确认页面")
     def go_to_confirm_page(self):
         """跳转到确认页面"""
@@ -156,9 +249,15 @@ class ReservePage(BasePage):
     def get_plan_name(self) -> str:
         """获取计划名称"""
         # 等待计划名称文本出现
-        self.wait.until(lambda driver: re.search(r'\S+', self.get_text(PLAN_NAME_TEXT)))
+        self.wait_for_text_matches(PLAN_NAME_TEXT, r'\S+')
         return self.get_text(PLAN_NAME_TEXT)
     
+    def snapshot(self) -> Dict[str, str]:
+        """一次读取所有输入框的当前值，键名与get_xxx方法对应"""
+        # 输入框初始值由页面脚本填充，计划名称出现说明脚本已执行（eager加载策略下需要）
+        self.wait_for_text_matches(PLAN_NAME_TEXT, r'\S+')
+        return self.get_properties(SNAPSHOT_FIELDS, "value")
+    
     def get_reserve_date(self) -> str:
         """获取预订日期"""
         return self.get_property(DATE_INPUT, "value")
@@ -184,14 +283,11 @@ class ReservePage(BasePage):
         return self.get_property(TEL_INPUT, "value")
     
     def _get_message_with_fallback(self, primary_locator, fallback_locator) -> str:
-        """获取错误消息的通用方法，支持备用定位符"""
-        try:
-            return self.get_text(primary_locator)
-        except:
-            try:
-                return self.get_text(fallback_locator)
-            except:
-                return ""
+        """获取错误消息的通用方法，支持备用定位符；两个定位符一次查询，都不存在时立即返回空字符串"""
+        found = self.find_first([primary_locator, fallback_locator], timeout=0)
+        if found is None:
+            return ""
+        return found[1].text
     
     def get_reserve_date_message(self) -> str:
         """获取预订日期错误信息"""
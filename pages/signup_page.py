@@ -1,8 +1,9 @@
 from selenium.webdriver.common.by import By
 from pages.base_page import BasePage
+from pages.async_base_page import AsyncBasePage
 from datetime import date
 from enum import Enum
-from typing import Optional
+from typing import Any, Dict, List, Optional, Tuple, Union
 
 # ================== 注册页面定位符 ==================
 EMAIL_INPUT = (By.ID, "email")
@@ -18,6 +19,16 @@ BIRTHDAY_INPUT = (By.ID, "birthday")
 NOTIFICATION_CHECKBOX = (By.ID, "notification")
 SIGNUP_BUTTON = (By.CSS_SELECTOR, "#signup-form > button")
 
+# fill_form中直接按值设置的文本字段
+FORM_FIELDS = {
+    "email": EMAIL_INPUT,
+    "password": PASSWORD_INPUT,
+    "password_confirmation": PASSWORD_CONFIRMATION_INPUT,
+    "username": USERNAME_INPUT,
+    "address": ADDRESS_INPUT,
+    "tel": TEL_INPUT,
+}
+
 # 错误消息定位符
 EMAIL_MESSAGE = (By.CSS_SELECTOR, "#email ~ .invalid-feedback")
 PASSWORD_MESSAGE = (By.CSS_SELECTOR, "#password ~ .invalid-feedback")
@@ -41,6 +52,46 @@ class Gender(Enum):
     OTHER = "9"
 
 
+def _parse_birthday(birthday: Union[date, str, None]) -> Optional[date]:
+    """把"YYYY-MM-DD"字符串转换为date，空值返回None"""
+    if not birthday:
+        return None
+    if isinstance(birthday, date):
+        return birthday
+    return date.fromisoformat(birthday)
+
+
+def _normalize_form_data(data: Dict[str, Any]) -> Dict[str, Any]:
+    """把rank/gender转换为枚举，birthday转换为date"""
+    values = dict(data)
+    if 'rank' in values:
+        values['rank'] = Rank(values['rank'])
+    if 'gender' in values:
+        values['gender'] = Gender(values['gender'])
+    if 'birthday' in values:
+        values['birthday'] = _parse_birthday(values['birthday'])
+    return values
+
+
+def _form_field_values(values: Dict[str, Any]) -> List[Tuple[Tuple[By, str], Any]]:
+    """把表单数据转换为set_field_values的 (定位符, 值) 列表"""
+    fields = []
+    for name, locator in FORM_FIELDS.items():
+        if name in values:
+            fields.append((locator, values[name]))
+    if 'rank' in values:
+        rank_radio = RANK_PREMIUM_RADIO if values['rank'] == Rank.PREMIUM else RANK_NORMAL_RADIO
+        fields.append((rank_radio, True))
+    if 'gender' in values:
+        fields.append((GENDER_SELECT, values['gender'].value))
+    if 'birthday' in values:
+        birthday = values['birthday']
+        fields.append((BIRTHDAY_INPUT, birthday.strftime("%Y-%m-%d") if birthday else ""))
+    if 'notification' in values:
+        fields.append((NOTIFICATION_CHECKBOX, bool(values['notification'])))
+    return fields
+
+
 class SignupPage(BasePage):
     def __init__(self, driver):
         super().__init__(driver)
@@ -97,6 +148,38 @@ class SignupPage(BasePage):
         """设置通知选项"""
         self.set_checkbox(NOTIFICATION_CHECKBOX, checked)
     
+    def fill_form(self, data: Dict[str, Any], realistic_typing: bool = False) -> None:
+        """
+        填写注册表单，只填写data中出现的字段
+        
+        Args:
+            data: 键为email、password、password_confirmation、username、rank、address、
+                  tel、gender、birthday、notification；rank/gender可以是枚举或枚举值，
+                  birthday可以是date或"YYYY-MM-DD"字符串
+            realistic_typing: 为True时逐个字段模拟键盘输入，默认在一次JS调用中设置所有字段
+        """
+        values = _normalize_form_data(data)
+        
+        if realistic_typing:
+            setters = {
+                'email': self.set_email,
+                'password': self.set_password,
+                'password_confirmation': self.set_password_confirmation,
+                'username': self.set_username,
+                'rank': self.set_rank,
+                'address': self.set_address,
+                'tel': self.set_tel,
+                'gender': self.set_gender,
+                'birthday': self.set_birthday,
+                'notification': self.set_notification,
+            }
+            for name, setter in setters.items():
+                if name in values:
+                    setter(values[name])
+            return
+        
+        self.set_field_values(_form_field_values(values))
+    
     def go_to_my_page(self):
         """提交注册表单并跳转到个人页面"""
         self.click_element(SIGNUP_BUTTON)
@@ -139,4 +222,16 @@ class SignupPage(BasePage):
     
     def get_birthday_message(self) -> str:
         """获取生日验证消息"""
-        return self.get_text(BIRTHDAY_MESSAGE) 
\ No newline at end of file
+        return self.get_text(BIRTHDAY_MESSAGE)
+
+
+class AsyncSignupPage(AsyncBasePage):
+    """注册页面的异步版本"""
+    
+    async def wait_until_ready(self) -> None:
+        await self.wait_for_title_contains("Sign up")
+        await self.verify_page_title("Sign up")
+    
+    async def fill_form(self, data: Dict[str, Any]) -> None:
+        """在一次脚本调用中填写注册表单，参数与SignupPage.fill_form相同"""
+        await self.set_field_values(_form_field_values(_normalize_form_data(data)))
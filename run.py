@@ -1,26 +1,65 @@
+import argparse
 import pytest
-import os
 from common.utils import Utils
+from common.allure_store import AllureStore
+from common.summary_report import SummaryReport
+from common.parallel_runner import ParallelRunner
+from common.impact import impacted_tests
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="运行酒店预订平台自动化测试")
+    parser.add_argument("-n", "--workers", type=int, default=1,
+                        help="并行工作进程数，每个进程使用独立的浏览器（默认1，即串行运行）")
+    parser.add_argument("--allure-html", action="store_true",
+                        help="额外使用Allure CLI生成完整的Allure HTML报告（需要安装Allure和Java）")
+    parser.add_argument("--pytest-html", action="store_true",
+                        help="额外生成pytest-html报告 reports/report.html")
+    parser.add_argument("--impacted", nargs="?", const="HEAD", metavar="BASE",
+                        help="只运行受变更影响的测试，BASE为比较的基准（默认HEAD，即未提交的修改）")
+    return parser.parse_args()
+
 
 if __name__ == "__main__":
-    # 清理3天前的allure结果文件
+    args = parse_args()
+
+    test_paths = ["testcase/"]
+    if args.impacted:
+        # 按依赖图选择受影响的测试，依赖图缓存在 .impact_cache/ 中
+        test_paths = impacted_tests(args.impacted)
+        if not test_paths:
+            print(f"相对于 {args.impacted} 没有受影响的测试")
+            raise SystemExit(0)
+        print(f"相对于 {args.impacted} 受影响的测试: {len(test_paths)} 个")
+
+    # 清理1天前的allure运行结果，本次运行写入新的结果目录
     Utils.clean_old_allure_results(days_to_keep=1)
-    
-    pytest.main([
-        "testcase/",
-        "--alluredir=reports/allure-results",
-        "--html=reports/report.html",
-        "--self-contained-html",
+    allure_store = AllureStore()
+    run_id = allure_store.new_run()
+
+    pytest_args = [
+        f"--alluredir={allure_store.run_dir(run_id)}",
         "-v"
-    ])
-
-    # 生成Allure HTML报告
-    allure_cmd = "allure generate reports/allure-results -o reports/allure-html --clean"
-    
-    # 使用os.system执行命令
-    result = os.system(allure_cmd)
-    
-    if result == 0:
-        print("Allure报告生成成功")
+    ]
+    if args.pytest_html:
+        pytest_args += ["--html=reports/report.html", "--self-contained-html"]
+
+    # 测试运行期间逐个读取写出的结果，结束时直接输出汇总报告
+    summary = SummaryReport(allure_store.run_dir(run_id))
+    summary.follow()
+
+    if args.workers > 1:
+        exit_code = ParallelRunner(args.workers, test_paths, pytest_args).run()
     else:
-        print("Allure报告生成失败")
+        exit_code = pytest.main([*test_paths, *pytest_args])
+    allure_store.finish_run(run_id, exit_code)
+
+    summary.stop()
+    print(f"汇总报告: {summary.write('reports/summary.html')}")
+
+    # 只为本次运行生成Allure HTML报告，历史趋势从上一份报告延续
+    if args.allure_html:
+        if allure_store.generate_report():
+            print("Allure报告生成成功")
+        else:
+            print("Allure报告生成失败")
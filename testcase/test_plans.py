@@ -2,6 +2,7 @@ import pytest
 import allure
 from pages.top_page import TopPage
 from common.utils import Utils
+from common.pricing import PLAN_PRICES
 
 
 @allure.feature("预订方案")
@@ -28,16 +29,18 @@ class TestPlans:
             assert plan_titles[4] == "With private onsen"
             assert plan_titles[5] == "For honeymoon"
             assert plan_titles[6] == "With complimentary ticket"
+        
+        with allure.step("验证方案金额和ID"):
+            special_offers = plans_page.get_plan("Plan with special offers")
+            assert special_offers.plan_id == "0"
+            assert special_offers.price == PLAN_PRICES["Plan with special offers"]
     
     @allure.story("方案列表")
     @allure.title("普通会员登录时应该显示方案列表")
     @pytest.mark.order(2)
-    def test_plan_list_login_normal(self, driver):
+    def test_plan_list_login_normal(self, driver, session_cache):
         """测试普通会员登录时方案列表显示"""
-        driver.get(Utils.BASE_URL)
-        top_page = TopPage(driver)
-        login_page = top_page.go_to_login_page()
-        my_page = login_page.do_login("diana@example.com", "pass1234")
+        my_page = session_cache.login("diana@example.com", "pass1234")
         
         plans_page = my_page.go_to_plans_page()
         plan_titles = plans_page.get_plan_titles()
@@ -57,12 +60,9 @@ class TestPlans:
     @allure.story("方案列表")
     @allure.title("高级会员登录时应该显示方案列表")
     @pytest.mark.order(3)
-    def test_plan_list_login_premium(self, driver):
+    def test_plan_list_login_premium(self, driver, session_cache):
         """测试高级会员登录时方案列表显示"""
-        driver.get(Utils.BASE_URL)
-        top_page = TopPage(driver)
-        login_page = top_page.go_to_login_page()
-        my_page = login_page.do_login("clark@example.com", "password")
+        my_page = session_cache.login("clark@example.com", "password")
         
         plans_page = my_page.go_to_plans_page()
         plan_titles = plans_page.get_plan_titles()
@@ -78,4 +78,9 @@ class TestPlans:
             assert plan_titles[6] == "With beauty salon"
             assert plan_titles[7] == "With private onsen"
             assert plan_titles[8] == "For honeymoon"
-            assert plan_titles[9] == "With complimentary ticket" 
\ No newline at end of file
+            assert plan_titles[9] == "With complimentary ticket"
+        
+        with allure.step("验证方案金额"):
+            plan_prices = plans_page.get_plan_prices()
+            assert plan_prices["Plan with special offers"] == PLAN_PRICES["Plan with special offers"]
+            assert plan_prices["Premium plan"] == PLAN_PRICES["Premium plan"] 
\ No newline at end of file
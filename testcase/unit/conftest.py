@@ -0,0 +1,17 @@
+import pytest
+
+
+# 单元测试不需要浏览器：覆盖根目录conftest.py中依赖driver的自动fixture
+@pytest.fixture(scope="class", autouse=True)
+def fresh_browser():
+    yield
+
+
+@pytest.fixture(autouse=True)
+def allow_resources():
+    yield
+
+
+@pytest.fixture(autouse=True)
+def reset_browser_state():
+    yield
@@ -0,0 +1,94 @@
+import json
+import os
+import time
+import allure
+from common.allure_store import AllureStore
+from common.utils import Utils
+
+DAY = 86400
+
+
+def make_runs(runs_dir, ages_in_days):
+    """按开始时间从早到晚创建运行目录和manifest，返回运行ID"""
+    now = time.time()
+    runs = []
+    for i, age in enumerate(ages_in_days):
+        run_id = f"run-{i}"
+        (runs_dir / run_id).mkdir(parents=True)
+        (runs_dir / run_id / f"{run_id}-result.json").write_text("{}", encoding="utf-8")
+        runs.append({'id': run_id, 'started': now - age * DAY, 'finished': None,
+                     'exit_code': 0, 'results': 1, 'reported': False})
+    (runs_dir / "manifest.json").write_text(json.dumps({'runs': runs}), encoding="utf-8")
+    return [run['id'] for run in runs]
+
+
+def write_legacy_results(legacy_dir, age_in_days):
+    legacy_dir.mkdir(parents=True)
+    timestamp = time.time() - age_in_days * DAY
+    for name in ("a-result.json", "b-result.json", "c-container.json"):
+        path = legacy_dir / name
+        path.write_text("{}", encoding="utf-8")
+        os.utime(path, (timestamp, timestamp))
+
+
+@allure.feature("Allure结果存储")
+class TestAllureStore:
+
+    @allure.story("清理旧运行")
+    def test_prune_by_age(self, tmp_path):
+        """删除超过保留天数的运行目录并更新manifest"""
+        store = AllureStore(tmp_path)
+        run_ids = make_runs(tmp_path, [5, 2, 0.5, 0])
+
+        assert store.prune(days_to_keep=1) == 2
+
+        assert [run['id'] for run in store.runs()] == run_ids[2:]
+        assert not (tmp_path / run_ids[0]).exists() and not (tmp_path / run_ids[1]).exists()
+        assert (tmp_path / run_ids[2]).exists() and (tmp_path / run_ids[3]).exists()
+
+    @allure.story("清理旧运行")
+    def test_prune_keeps_latest_run(self, tmp_path):
+        """最新一次运行即使超过保留天数或数量也保留"""
+        store = AllureStore(tmp_path)
+        run_ids = make_runs(tmp_path, [5, 3])
+
+        assert store.prune(days_to_keep=1, keep_runs=0) == 1
+        assert [run['id'] for run in store.runs()] == run_ids[1:]
+
+    @allure.story("清理旧运行")
+    def test_prune_without_changes_keeps_manifest(self, tmp_path):
+        """没有要删除的运行时不改写manifest"""
+        store = AllureStore(tmp_path)
+        make_runs(tmp_path, [0.5, 0])
+        mtime = store.manifest_path.stat().st_mtime_ns
+
+        assert store.prune(days_to_keep=1, keep_runs=5) == 0
+        assert store.manifest_path.stat().st_mtime_ns == mtime
+        assert AllureStore(tmp_path / "missing").prune(days_to_keep=1) == 0
+
+    @allure.story("旧版本结果目录")
+    def test_migrate_legacy_results(self, tmp_path):
+        """旧的allure-results目录移动为一次已生成报告的运行，按开始时间排序"""
+        store = AllureStore(tmp_path / "allure-runs")
+        make_runs(store.runs_dir, [0])
+        write_legacy_results(tmp_path / "allure-results", 2)
+
+        run_id = store.migrate_legacy(tmp_path / "allure-results")
+
+        assert not (tmp_path / "allure-results").exists()
+        assert (store.run_dir(run_id) / "a-result.json").exists()
+        legacy = store.runs()[0]
+        assert legacy['id'] == run_id and legacy['results'] == 2 and legacy['reported']
+        assert store.migrate_legacy(tmp_path / "allure-results") is None
+
+    @allure.story("旧版本结果目录")
+    def test_clean_old_results_removes_legacy_results(self, tmp_path):
+        """清理时旧版本的结果同样按时间删除"""
+        make_runs(tmp_path / "allure-runs", [0])
+        write_legacy_results(tmp_path / "allure-results", 3)
+
+        Utils.clean_old_allure_results(days_to_keep=1, reports_dir=str(tmp_path))
+
+        assert not (tmp_path / "allure-results").exists()
+        assert [run['id'] for run in AllureStore(tmp_path / "allure-runs").runs()] == ["run-0"]
+        assert sorted(path.name for path in (tmp_path / "allure-runs").iterdir()) == ["manifest.json", "run-0"]
@@ -0,0 +1,71 @@
+import pytest
+import allure
+from common.case_index import CaseIndex
+from common.case_store import CaseStore
+
+CASES_YAML = """\
+cases:
+  - id: "a#b"  # 引号中的#不是注释
+    value: 1
+  -   id: 'plain' # 注释
+      value: 2
+  - id: 3
+    value: 3
+  - value: 4
+    id: last
+"""
+
+
+@pytest.fixture
+def cases_file(tmp_path):
+    path = tmp_path / "cases.yaml"
+    path.write_text(CASES_YAML, encoding="utf-8")
+    return path
+
+
+@pytest.fixture
+def unsupported_file(tmp_path):
+    """使用锚点的同样内容，索引不可用，退回到解析整个文件"""
+    path = tmp_path / "anchored.yaml"
+    path.write_text(CASES_YAML + "defaults: &defaults\n  value: 0\n", encoding="utf-8")
+    return path
+
+
+@allure.feature("用例文件索引")
+class TestCaseIndex:
+
+    @allure.story("id解析")
+    def test_ids_are_parsed_as_yaml_strings(self, cases_file):
+        """引号中的#、注释和整数id都按YAML解析，并统一为字符串"""
+        index = CaseIndex.build(cases_file)
+
+        assert index.is_supported
+        assert [case.case_id for case in index.section("cases").cases] == ["a#b", "plain", "3", "last"]
+        key, case = index.find_case("3")
+        assert key == "cases"
+        assert index.load_case(case) == {"id": 3, "value": 3}
+
+    @allure.story("不支持的结构")
+    @pytest.mark.parametrize("content", [
+        "cases:\n  - {id: x}\n",
+        "cases:\n  - value: 1\n",
+        "cases:\n  - id: |\n      multi\n",
+    ], ids=["flow_mapping", "no_id", "block_scalar"])
+    def test_unrecognised_ids_disable_index(self, tmp_path, content):
+        """没有可识别的id行时索引不可用"""
+        path = tmp_path / "cases.yaml"
+        path.write_text(content, encoding="utf-8")
+
+        assert not CaseIndex.build(path).is_supported
+
+    @allure.story("按id选择用例")
+    def test_index_and_fallback_select_same_cases(self, cases_file, unsupported_file):
+        """使用索引和解析整个文件两种方式选择的用例相同"""
+        store = CaseStore(cache_dir=None)
+        store.select(["a#b", "3"])
+
+        assert not store.index(str(unsupported_file)).is_supported
+        expected = [{"id": "a#b", "value": 1}, {"id": 3, "value": 3}]
+        assert [dict(case) for case in store.get_cases(str(cases_file), "cases")] == expected
+        assert [dict(case) for case in store.get_cases(str(unsupported_file), "cases")] == expected
+        assert [dict(case) for case in store.iter_cases(str(unsupported_file), "cases")] == expected
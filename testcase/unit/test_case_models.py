@@ -0,0 +1,114 @@
+import pytest
+import allure
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Mapping, Optional, Tuple, Union
+from common.case_models import CaseRecord, CaseSchemaError, build_cases, model_for
+from common.case_store import DATA_DIR, CaseStore
+
+
+@dataclass(frozen=True, slots=True)
+class Login(CaseRecord):
+    email: str
+    password: str
+
+
+@dataclass(frozen=True, slots=True)
+class SampleCase(CaseRecord):
+    id: str
+    count: int
+    login: Login
+    tags: Tuple[str, ...]
+    expected: Mapping[str, str]
+    comment: Optional[str] = None
+    term: Union[int, str] = 1
+
+
+VALID = {
+    "id": "sample",
+    "count": 2,
+    "login": {"email": "clark@example.com", "password": "password"},
+    "tags": ["a", "b"],
+    "expected": {"rank": "Premium"},
+}
+
+
+def build(**changes):
+    data = dict(VALID, **changes)
+    return SampleCase.from_mapping(data, "cases.yaml:sample_cases[sample]")
+
+
+@allure.feature("用例模型")
+class TestCaseModels:
+
+    @allure.story("转换")
+    def test_valid_case(self):
+        """嵌套用例转换为模型，列表转换为tuple，映射转换为只读映射，可选字段使用默认值"""
+        case = build()
+
+        assert case.login == Login("clark@example.com", "password")
+        assert case.tags == ("a", "b")
+        assert isinstance(case.expected, MappingProxyType)
+        assert case.expected["rank"] == "Premium"
+        assert case.comment is None and case.term == 1
+
+    @allure.story("转换")
+    def test_case_is_immutable(self):
+        """模型和其中的映射都不能修改"""
+        case = build()
+
+        with pytest.raises(AttributeError):
+            case.count = 3
+        with pytest.raises(TypeError):
+            case.expected["rank"] = "Normal"
+
+    @allure.story("转换")
+    @pytest.mark.parametrize("changes, expected", [
+        ({"comment": None}, None),
+        ({"comment": "note"}, "note"),
+        ({"term": 3}, 3),
+        ({"term": "three"}, "three"),
+    ], ids=["optional_none", "optional_value", "union_int", "union_str"])
+    def test_optional_and_union(self, changes, expected):
+        """Optional接受None，Union依次尝试各类型"""
+        name = next(iter(changes))
+        assert getattr(build(**changes), name) == expected
+
+    @allure.story("校验错误")
+    @pytest.mark.parametrize("data, message", [
+        (dict(VALID, extra=1), "未知字段 ['extra']"),
+        ({key: value for key, value in VALID.items() if key != "count"}, "缺少字段 ['count']"),
+        (dict(VALID, count=True), "sample_cases[sample].count: 类型应为 int"),
+        (dict(VALID, count="2"), "sample_cases[sample].count: 类型应为 int"),
+        (dict(VALID, term=1.5), "sample_cases[sample].term: 类型应为"),
+        (dict(VALID, tags="a"), "sample_cases[sample].tags: 应为列表"),
+        (dict(VALID, tags=["a", 1]), "sample_cases[sample].tags[1]: 类型应为 str"),
+        (dict(VALID, expected=["rank"]), "sample_cases[sample].expected: 应为映射"),
+        (dict(VALID, login={"email": "clark@example.com"}), "sample_cases[sample].login: 缺少字段 ['password']"),
+        ("not a mapping", "应为映射"),
+    ], ids=["unknown_field", "missing_field", "bool_for_int", "str_for_int", "union_mismatch",
+            "str_for_tuple", "tuple_item", "list_for_mapping", "nested_missing", "not_mapping"])
+    def test_schema_errors(self, data, message):
+        """字段不符合模型时抛出CaseSchemaError，消息中包含出错的位置"""
+        with pytest.raises(CaseSchemaError) as error:
+            SampleCase.from_mapping(data, "cases.yaml:sample_cases[sample]")
+        assert message in str(error.value)
+
+    @allure.story("用例段模型")
+    def test_build_cases_reports_case_id(self):
+        """批量转换时错误位置包含文件名、用例段和用例id"""
+        with pytest.raises(CaseSchemaError, match=r"cases\.yaml:sample_cases\[broken\]"):
+            build_cases(SampleCase, [VALID, dict(VALID, id="broken", count=None)], "data/cases.yaml", "sample_cases")
+
+    @allure.story("用例段模型")
+    def test_data_files_match_models(self):
+        """data目录中定义了模型的用例段都能通过校验"""
+        store = CaseStore(cache_dir=None)
+        checked = 0
+        for path in sorted(DATA_DIR.glob("*.yaml")):
+            for case_key in store.load(str(path)):
+                model = model_for(str(path), case_key)
+                if model is not None:
+                    assert all(isinstance(case, model) for case in store.get_cases(str(path), case_key))
+                    checked += 1
+        assert checked > 0
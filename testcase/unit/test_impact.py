@@ -0,0 +1,37 @@
+import pytest
+import allure
+from common.impact import build_graph
+
+
+@pytest.fixture(scope="module")
+def graph():
+    """不读写缓存，直接分析当前代码"""
+    return build_graph(cache_file=None)
+
+
+@allure.feature("测试影响分析")
+class TestImpact:
+    
+    @allure.story("通过会话缓存登录的测试")
+    def test_login_page_selects_session_cache_tests(self, graph):
+        """登录页面变化时，通过session_cache登录的测试也应该被选中"""
+        selected = graph.impacted_tests(["pages/login_page.py"])
+        
+        assert "testcase/test_login.py::TestLogin::test_login_success" in selected
+        assert "testcase/test_reserve.py::TestReserveParameterized::test_reserve_success" in selected
+        assert "testcase/test_redirection.py::TestRedirection::test_login_page_to_top" in selected
+        assert "testcase/test_plans.py::TestPlans::test_plan_list_login_normal" in selected
+    
+    @allure.story("导航方法中使用的页面")
+    def test_icon_page_selects_only_icon_tests(self, graph):
+        """头像设置页面变化时只选中经过go_to_icon_page的测试"""
+        selected = graph.impacted_tests(["pages/icon_page.py"])
+        
+        assert "testcase/test_mypage.py::TestMyPageParameterized::test_icon_settings" in selected
+        assert "testcase/test_login.py::TestLogin::test_login_success" not in selected
+        assert "testcase/test_reserve.py::TestReserveParameterized::test_reserve_success" not in selected
+    
+    @allure.story("全局文件")
+    def test_conftest_selects_all_tests(self, graph):
+        """conftest.py变化时选中所有测试"""
+        assert len(graph.impacted_tests(["conftest.py"])) == len(graph.tests())
@@ -0,0 +1,69 @@
+import pytest
+import allure
+from urllib.error import HTTPError
+from urllib.request import urlopen
+from common.local_server import LocalSiteServer, SITE_PAGES, mirror_site
+
+
+@pytest.fixture
+def site_dir(tmp_path):
+    """最小的站点目录：所有页面，首页引用样式和脚本，脚本引用图片和不存在的文件"""
+    locale_dir = tmp_path / "site" / "en-US"
+    (locale_dir / "css").mkdir(parents=True)
+    (locale_dir / "js").mkdir()
+    (locale_dir / "img").mkdir()
+    for page in SITE_PAGES:
+        (locale_dir / page).write_text(f"<html><title>{page}</title></html>", encoding="utf-8")
+    (locale_dir / "index.html").write_text(
+        '<html><link href="css/site.css" rel="stylesheet"><script src="js/app.js"></script></html>',
+        encoding="utf-8"
+    )
+    (locale_dir / "css" / "site.css").write_text("body { background: url('../img/bg.png'); }", encoding="utf-8")
+    (locale_dir / "js" / "app.js").write_text(
+        "import './plans.mjs'; img.src = '../img/icon.svg'; fetch('missing.json');", encoding="utf-8"
+    )
+    (locale_dir / "js" / "plans.mjs").write_text("export const plans = [];", encoding="utf-8")
+    (locale_dir / "img" / "bg.png").write_bytes(b"png")
+    (locale_dir / "img" / "icon.svg").write_text("<svg/>", encoding="utf-8")
+    return tmp_path / "site"
+
+
+@pytest.fixture
+def server(site_dir):
+    server = LocalSiteServer(site_dir)
+    server.start()
+    yield server
+    server.stop()
+
+
+@allure.feature("本地站点")
+class TestLocalSiteServer:
+
+    @allure.story("提供页面")
+    def test_serves_pages(self, server):
+        """本地服务器按站点路径提供页面和脚本"""
+        with urlopen(f"{server.base_url}/login.html") as response:
+            assert response.read() == b"<html><title>login.html</title></html>"
+        with urlopen(f"{server.base_url}/js/plans.mjs") as response:
+            assert response.headers["Content-Type"].startswith("text/javascript")
+        with pytest.raises(HTTPError):
+            urlopen(f"{server.base_url}/nothing.html")
+
+    @allure.story("镜像不存在")
+    def test_unavailable_without_pages(self, tmp_path):
+        """缺少页面时镜像不可用，启动时报错"""
+        server = LocalSiteServer(tmp_path)
+        assert not server.is_available()
+        with pytest.raises(FileNotFoundError):
+            server.start()
+
+    @allure.story("生成镜像")
+    def test_mirror_follows_script_references_and_skips_failures(self, server, tmp_path):
+        """镜像包括脚本中引用的资源，下载失败的文件被跳过并报告"""
+        mirror_dir = tmp_path / "mirror"
+        result = mirror_site(server.base_url, mirror_dir, timeout=5)
+
+        assert result.failed == [f"{server.base_url}/js/missing.json"]
+        for path in ("css/site.css", "js/app.js", "js/plans.mjs", "img/bg.png", "img/icon.svg"):
+            assert (mirror_dir / "en-US" / path).exists()
+        assert LocalSiteServer(mirror_dir).is_available()
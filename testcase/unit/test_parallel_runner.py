@@ -0,0 +1,95 @@
+import json
+import allure
+from common.durations import DEFAULT_SECONDS, DurationStore
+from common.parallel_runner import ParallelRunner
+
+NODE_IDS = [
+    "testcase/test_a.py::TestA::test_one[case1]",
+    "testcase/test_a.py::TestA::test_one[case::2]",
+    "testcase/test_a.py::TestA::test_two",
+    "testcase/test_b.py::TestB::test_one",
+    "testcase/test_c.py::test_function",
+]
+
+
+def cost_of(shard, costs):
+    return sum(costs[node_id] for node_id in shard)
+
+
+@allure.feature("并行执行")
+class TestSharding:
+
+    @allure.story("按测试类分组")
+    def test_group_by_class(self):
+        """同一测试类的测试（包括参数中含::的）在同一组，保持收集顺序"""
+        assert ParallelRunner.group_node_ids(NODE_IDS) == [NODE_IDS[:3], NODE_IDS[3:4], NODE_IDS[4:]]
+
+    @allure.story("最长处理时间优先")
+    def test_shard_balances_estimated_load(self):
+        """分组从长到短分给负载最少的进程，两个进程的估计耗时相同"""
+        groups = [[f"test_{cost}"] for cost in (1, 3, 5, 2, 4, 3)]
+        costs = {group[0]: float(group[0].split("_")[1]) for group in groups}
+
+        shards = ParallelRunner.shard(groups, 2, costs.__getitem__)
+
+        assert [cost_of(shard, costs) for shard in shards] == [9.0, 9.0]
+
+    @allure.story("最长处理时间优先")
+    def test_shard_never_splits_groups(self):
+        """同一测试类的测试总是分到同一进程并保持顺序"""
+        groups = [["a1", "a2", "a3"], ["b1"], ["c1", "c2"]]
+
+        shards = ParallelRunner.shard(groups, 3)
+
+        assert sorted(shards) == sorted(groups)
+        assert ParallelRunner.shard(groups, 5) == shards
+
+    @allure.story("没有历史耗时")
+    def test_unknown_tests_use_median_estimate(self, tmp_path):
+        """没有记录的测试按同一函数其他参数的中位数、再按所有测试的中位数估计"""
+        store = DurationStore(tmp_path)
+        store.record("gw0", {
+            "t.py::T::test_a[1]": 1.0,
+            "t.py::T::test_a[2]": 3.0,
+            "t.py::T::test_a[3]": 8.0,
+            "t.py::T::test_b": 10.0,
+        })
+
+        assert store.estimate("t.py::T::test_a[4]") == 3.0
+        assert store.estimate("t.py::T::test_new") == 5.5
+        assert DurationStore(tmp_path / "empty").estimate("t.py::T::test_a[1]") == DEFAULT_SECONDS
+
+        # test_a组12.0先分给第一个进程，test_b 10.0和按中位数5.5计算的test_new分给第二个进程
+        groups = [["t.py::T::test_a[1]", "t.py::T::test_a[2]", "t.py::T::test_a[3]"],
+                  ["t.py::T::test_b"], ["t.py::U::test_new"]]
+        shards = ParallelRunner.shard(groups, 2, store.estimate)
+        assert shards == [groups[0], ["t.py::T::test_b", "t.py::U::test_new"]]
+        assert [sum(store.estimate(node_id) for node_id in shard) for shard in shards] == [12.0, 15.5]
+
+
+@allure.feature("并行执行")
+class TestDurationStore:
+
+    @allure.story("合并工作进程耗时")
+    def test_merge_applies_moving_average(self, tmp_path):
+        """各进程文件按指数移动平均合并到数据库，合并后删除进程文件"""
+        store = DurationStore(tmp_path)
+        (tmp_path / "durations.json").write_text(json.dumps({"a": 2.0, "c": 5.0}), encoding="utf-8")
+        store.record("gw0", {"a": 4.0, "b": 1.0})
+        store.record("gw1", {"a": 7.0})
+
+        merged = store.merge()
+
+        # a: 2 -> 2 + 0.5 × (4 - 2) = 3 -> 3 + 0.5 × (7 - 3) = 5
+        assert merged == {"a": 5.0, "b": 1.0, "c": 5.0}
+        assert json.loads((tmp_path / "durations.json").read_text(encoding="utf-8")) == merged
+        assert not list(tmp_path.glob("durations-*.json"))
+
+    @allure.story("合并工作进程耗时")
+    def test_record_ignores_empty_durations(self, tmp_path):
+        """没有耗时时不写文件，合并结果为空"""
+        store = DurationStore(tmp_path)
+        store.record("gw0", {})
+
+        assert store.merge() == {}
+        assert not (tmp_path / "durations.json").exists()
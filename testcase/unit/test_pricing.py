@@ -0,0 +1,72 @@
+import pytest
+import allure
+from datetime import date, timedelta
+from decimal import Decimal
+from common.pricing import (
+    BOOKING_WINDOW_DAYS, MAX_TERM, PriceCalendar, Reservation, day_multiplier, format_total_bill
+)
+
+# 2024-01-01是星期一
+TODAY = date(2024, 1, 1)
+TUESDAY = date(2024, 1, 2)
+FRIDAY = date(2024, 1, 5)
+SATURDAY = date(2024, 1, 6)
+
+
+@pytest.fixture(scope="module")
+def calendar():
+    return PriceCalendar(TODAY)
+
+
+@allure.feature("预订金额计算")
+class TestPricing:
+
+    @allure.story("房费")
+    def test_weekday_stay(self, calendar):
+        """工作日按原价计算"""
+        assert calendar.total(Reservation("Plan with special offers", TUESDAY, 1, 1)) == Decimal("70")
+
+    @allure.story("房费")
+    def test_weekend_stay(self, calendar):
+        """周六、周日的晚上按1.25倍计算"""
+        assert calendar.total(Reservation("Plan with special offers", SATURDAY, 1, 1)) == Decimal("87.50")
+        assert calendar.total(Reservation("Premium plan", SATURDAY + timedelta(days=1), 1, 1)) == Decimal("125")
+
+    @allure.story("房费")
+    def test_stay_spanning_weekend(self, calendar):
+        """周五入住3晚：周五原价，周六和周日1.25倍"""
+        assert calendar.nights(FRIDAY, 3) == Decimal("3.5")
+        assert calendar.total(Reservation("Premium plan", FRIDAY, 3, 2)) == Decimal("700")
+
+    @allure.story("附加服务")
+    def test_add_ons_multiply_by_head_count(self, calendar):
+        """早餐按人数×晚数计算，提前入住和观光按人数计算"""
+        reservation = Reservation("Plan with special offers", TUESDAY, 3, 2,
+                                  breakfast=True, early_check_in=True, sightseeing=True)
+        # 房费 70×3×2，早餐 10×2×3，提前入住 10×2，观光 10×2
+        assert calendar.total(reservation) == Decimal("520")
+
+    @allure.story("预订窗口")
+    @pytest.mark.parametrize("offset", [BOOKING_WINDOW_DAYS, BOOKING_WINDOW_DAYS + 5, -1])
+    def test_window_edge_matches_night_by_night(self, calendar, offset):
+        """90天后入住最长天数时使用前缀和，超出表的范围时逐晚计算，结果相同"""
+        start = TODAY + timedelta(days=offset)
+        expected = sum(day_multiplier(start + timedelta(days=i)) for i in range(MAX_TERM))
+
+        assert calendar.nights(start, MAX_TERM) == expected
+
+    @allure.story("预订窗口")
+    def test_calendar_shared_per_day(self):
+        """同一天共用一个表"""
+        assert PriceCalendar.for_date(TODAY) is PriceCalendar.for_date(TODAY)
+
+    @allure.story("未知方案")
+    def test_unknown_plan(self, calendar):
+        with pytest.raises(KeyError):
+            calendar.total(Reservation("Economical", TUESDAY, 1, 1))
+
+    @allure.story("金额显示")
+    def test_format_total_bill(self):
+        """与确认页面显示的金额格式相同"""
+        assert format_total_bill(Decimal("1120")) == "Total $1,120.00 (included taxes)"
+        assert format_total_bill(Decimal("87.5")) == "Total $87.50 (included taxes)"
@@ -0,0 +1,101 @@
+import itertools
+import pytest
+import allure
+from selenium.common.exceptions import NoSuchWindowException, TimeoutException
+from common.tab_runner import TabRunner
+
+
+class FakeSwitchTo:
+    """只记录窗口句柄的switch_to"""
+
+    def __init__(self, driver):
+        self.driver = driver
+        self.ids = itertools.count(1)
+
+    def window(self, handle):
+        if handle not in self.driver.window_handles:
+            raise NoSuchWindowException(f"窗口已关闭: {handle}")
+        self.driver.current_window_handle = handle
+
+    def new_window(self, type_hint):
+        handle = f"tab-{next(self.ids)}"
+        self.driver.window_handles.append(handle)
+        self.driver.current_window_handle = handle
+
+
+class FakeDriver:
+    """TabRunner用到的窗口操作，不需要浏览器"""
+
+    def __init__(self):
+        self.window_handles = ["main"]
+        self.current_window_handle = "main"
+        self.switch_to = FakeSwitchTo(self)
+
+    def close(self):
+        self.window_handles.remove(self.current_window_handle)
+
+
+@pytest.fixture
+def driver():
+    return FakeDriver()
+
+
+def succeed(tab):
+    handle = yield lambda driver: driver.current_window_handle
+    return handle == tab.handle
+
+
+def yield_non_callable(tab):
+    yield 42
+
+
+def raise_in_condition(tab):
+    def condition(driver):
+        raise ValueError("条件出错")
+    yield condition
+
+
+def close_own_tab(tab):
+    tab.driver.close()
+    yield lambda driver: True
+
+
+@allure.feature("多标签页并发执行")
+class TestTabRunner:
+
+    @allure.story("单个流程失败不影响其他流程")
+    def test_failed_flows_do_not_abort_others(self, driver):
+        """条件出错、yield不可调用对象和标签页被关闭时，错误只记录在该流程的结果中"""
+        flows = [succeed, yield_non_callable, raise_in_condition, close_own_tab, succeed]
+        results = TabRunner(driver, max_tabs=2, poll_frequency=0).run(flows)
+
+        assert results[0].get() is True
+        assert isinstance(results[1].error, TypeError)
+        with pytest.raises(ValueError):
+            results[2].get()
+        assert isinstance(results[3].error, NoSuchWindowException)
+        assert results[4].get() is True
+        assert driver.window_handles == ["main"]
+        assert driver.current_window_handle == "main"
+
+    @allure.story("流程处理条件中的异常")
+    def test_condition_error_is_thrown_into_flow(self, driver):
+        """条件抛出的异常交给流程，流程捕获后可以继续执行"""
+        def flow(tab):
+            try:
+                yield from raise_in_condition(tab)
+            except ValueError as e:
+                return str(e)
+
+        assert TabRunner(driver).run([flow])[0].get() == "条件出错"
+
+    @allure.story("等待超时")
+    def test_condition_timeout(self, driver):
+        """条件一直不成立时流程得到TimeoutException"""
+        def flow(tab):
+            yield lambda driver: False
+
+        results = TabRunner(driver, timeout=0.05, poll_frequency=0.01).run([flow, lambda tab: "done"])
+
+        assert isinstance(results[0].error, TimeoutException)
+        assert results[1].get() == "done"
@@ -0,0 +1,31 @@
+import gc
+import weakref
+import allure
+from common.wait_engine import _FakeDriver, condition, get_wait
+
+
+@allure.feature("等待引擎")
+class TestWaitEngine:
+
+    @allure.story("共享WebDriverWait")
+    def test_wait_is_shared_per_driver(self):
+        """同一driver、超时和轮询间隔返回同一个WebDriverWait"""
+        driver, other = _FakeDriver(), _FakeDriver()
+
+        assert get_wait(driver, 10, 0.05) is get_wait(driver, 10, 0.05)
+        assert get_wait(driver, 5, 0.05) is not get_wait(driver, 10, 0.05)
+        assert get_wait(other, 10, 0.05) is not get_wait(driver, 10, 0.05)
+        assert get_wait(driver, 10, 0.05).until(condition('presence', ('id', 'plan-name')))
+
+    @allure.story("driver回收")
+    def test_driver_is_collected_with_its_waits(self):
+        """缓存的WebDriverWait不会让driver无法回收"""
+        driver = _FakeDriver()
+        wait = weakref.ref(get_wait(driver, 10, 0.05))
+        driver_ref = weakref.ref(driver)
+
+        del driver
+        gc.collect()
+
+        assert driver_ref() is None
+        assert wait() is None